@@ -1,12 +1,11 @@
 from __future__ import annotations
 
 import hashlib
-import math
-import random
 from dataclasses import dataclass
 from typing import Iterable, List, Protocol
 
 import httpx
+import numpy as np
 
 try:  # pragma: no cover - optional heavy dependency
     from sentence_transformers import SentenceTransformer
@@ -73,14 +72,22 @@ class StubEmbeddingProvider:
     def embed_texts(self, texts: Iterable[str]) -> List[List[float]]:
         """Return pseudo-random unit vectors seeded by text content."""
 
-        results: List[List[float]] = []
-        for text in texts:
-            seed = hashlib.sha256(text.encode("utf-8")).digest()
-            rnd = random.Random(seed)
-            vector = [rnd.uniform(-1.0, 1.0) for _ in range(self.dim)]
-            norm = math.sqrt(sum(v * v for v in vector)) or 1.0
-            results.append([v / norm for v in vector])
-        return results
+        return [_stub_embed(text, self.dim) for text in texts]
+
+
+def _stub_embed(text: str, dim: int) -> List[float]:
+    """Return the deterministic stub unit vector for ``text``."""
+
+    seed = hashlib.sha256(text.encode("utf-8")).digest()
+    rng = np.random.default_rng(np.frombuffer(seed, dtype=np.uint32))
+    # Map [0, 1) draws onto [-1, 1) and unit-normalise in vectorised passes.
+    vector = rng.random(dim)
+    vector *= 2.0
+    vector -= 1.0
+    norm = np.linalg.norm(vector)
+    if norm:
+        vector /= norm
+    return vector.tolist()
 
 
 def get_embedding_provider(settings: object) -> EmbeddingProvider:
@@ -25,11 +25,18 @@ class Settings(BaseSettings):
     url_max_pages: int = 5
     url_max_total_chars: int = 20000
     url_rate_limit_sec: float = 1.0
+    url_concurrency: int = 4
 
     # Graph / Vector
     neo4j_uri: str = "bolt://localhost:7687"
     neo4j_user: str = "neo4j"
     neo4j_password: str = "neo4j"
+    neo4j_database: str | None = None
+    neo4j_max_pool_size: int = 50
+    neo4j_acquisition_timeout_s: float = 30.0
+    neo4j_max_connection_lifetime_s: float = 3600.0
+    neo4j_vector_search: bool = False
+    neo4j_vector_dimensions: int = 384
     chroma_dir: Path = Path("store/chroma")
 
     # Embeddings
@@ -74,7 +81,15 @@ class Settings(BaseSettings):
         """Normalise embedding provider identifiers, defaulting to stub."""
         return (value or "stub").lower()
 
-    @field_validator("top_k", "chunk_tokens")
+    @field_validator("neo4j_database")
+    @classmethod
+    def blank_database_is_default(cls, value: str | None) -> str | None:
+        """Treat a blank database name as unset so the driver resolves the default database."""
+        if value is None:
+            return None
+        return value.strip() or None
+
+    @field_validator("top_k", "chunk_tokens", "url_concurrency")
     @classmethod
     def positive_int(cls, value: int) -> int:
         """Clamp integer configuration values to be strictly positive."""
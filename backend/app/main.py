@@ -1,12 +1,15 @@
 import logging
 import logging.config
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
 from pathlib import Path
-from typing import Any, Awaitable, Callable, Optional, Tuple
+from typing import Any, Awaitable, Callable, Optional, Tuple, TypeVar, Union
 
-from fastapi import FastAPI, File, HTTPException, Request, UploadFile
-from fastapi.responses import JSONResponse, Response
+from fastapi import APIRouter, Depends, FastAPI, File, HTTPException, Request, UploadFile
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.responses import FileResponse
 from starlette.staticfiles import StaticFiles
@@ -14,7 +17,7 @@ from starlette.staticfiles import StaticFiles
 import requests
 
 from backend.app.adapters.embeddings import StubEmbeddingProvider, get_embedding_provider
-from backend.app.core.config import get_settings
+from backend.app.core.config import Settings, get_settings
 from backend.app.models.dto import (
     AskRequest,
     AskResponse,
@@ -38,16 +41,28 @@ from backend.app.services.url_crawler import CrawlError, CrawlLimits, crawl_url
 from backend.app.store.graph_repo import GraphRepository, InMemoryGraphRepository
 from backend.app.store.vector_chroma import InMemoryVectorStore, VectorChromaStore
 
+GraphRepo = Union[GraphRepository, InMemoryGraphRepository]
+
 try:  # pragma: no cover - optional dependency for Neo4j
     from neo4j import GraphDatabase
 except ImportError:  # pragma: no cover
     GraphDatabase = None  # type: ignore
 
-SETTINGS = get_settings()
+try:  # pragma: no cover - optional faster JSON encoder
+    import orjson  # noqa: F401
+
+    DEFAULT_RESPONSE_CLASS: type[JSONResponse] = ORJSONResponse
+except ImportError:  # pragma: no cover - stdlib json remains the default
+    DEFAULT_RESPONSE_CLASS = JSONResponse
+
 LOGGING_CONFIG = Path(__file__).resolve().parents[1] / "logging.ini"
 FRONTEND_DIST = Path(__file__).resolve().parents[2] / "frontend" / "dist"
 MAX_BODY_BYTES = 1024 * 1024
 MAX_INGEST_BYTES = 5 * 1024 * 1024
+_HEALTH_PROBES = ThreadPoolExecutor(max_workers=4, thread_name_prefix="health-probe")
+_PROBE_TTL_S = 5.0
+
+T = TypeVar("T")
 
 if LOGGING_CONFIG.exists():
     logging.config.fileConfig(
@@ -63,23 +78,44 @@ else:  # pragma: no cover - fallback logging configuration
 
 logger = logging.getLogger("service-desk")
 
-app = FastAPI(title=SETTINGS.app_name)
-app.state.vector_store = InMemoryVectorStore()
-app.state.graph_repo = InMemoryGraphRepository()
-app.state.graph_driver = None
-app.state.graph_backend = "inmemory"
-app.state.provider = None  # populated via _set_active_provider
-app.state.provider_context = None
-app.state.active_provider_key = None
-app.state.settings = SETTINGS
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=SETTINGS.allowed_origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+router = APIRouter()
+
+
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    """Build the FastAPI application with in-memory stores and the initial provider."""
+    settings = settings or get_settings()
+    app = FastAPI(title=settings.app_name, default_response_class=DEFAULT_RESPONSE_CLASS)
+    _seed_state(app, settings)
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.allowed_origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    app.middleware("http")(enforce_body_limit)
+    app.middleware("http")(log_requests)
+    app.add_event_handler("startup", partial(_startup, app))
+    app.add_event_handler("shutdown", partial(_shutdown, app))
+    app.include_router(router)
+
+    if FRONTEND_DIST.exists():
+        app.mount("/", SpaStaticFiles(directory=str(FRONTEND_DIST), html=True), name="frontend")
+    return app
+
+
+def _seed_state(app: FastAPI, settings: Settings) -> None:
+    """Reset app.state to in-memory stores and the provider implied by settings."""
+    app.state.vector_store = InMemoryVectorStore()
+    app.state.graph_repo = InMemoryGraphRepository()
+    app.state.graph_driver = None
+    app.state.graph_backend = "inmemory"
+    app.state.provider = None  # populated via _set_active_provider
+    app.state.provider_context = None
+    app.state.active_provider_key = None
+    app.state.settings = settings
+    _set_active_provider(app, _initial_provider_key(settings), settings=settings)
 
 
 def _init_vector_store(settings):
@@ -97,21 +133,27 @@ def _init_graph_repo(settings):
 
     if not is_aura:
         logger.info("Neo4j Aura URI not configured; using in-memory graph store")
-        app.state.graph_backend = "inmemory"
         return InMemoryGraphRepository(), None
 
     if GraphDatabase is None:  # pragma: no cover - driver not installed
         logger.warning("neo4j driver not installed; using in-memory graph store")
-        app.state.graph_backend = "inmemory"
         return InMemoryGraphRepository(), None
 
     driver = None
     try:
-        driver = GraphDatabase.driver(uri, auth=(settings.neo4j_user, settings.neo4j_password))
+        driver = GraphDatabase.driver(
+            uri,
+            auth=(settings.neo4j_user, settings.neo4j_password),
+            max_connection_pool_size=settings.neo4j_max_pool_size,
+            connection_acquisition_timeout=settings.neo4j_acquisition_timeout_s,
+            max_connection_lifetime=settings.neo4j_max_connection_lifetime_s,
+            keep_alive=True,
+        )
         driver.verify_connectivity()
-        repo = GraphRepository(driver)
+        repo = GraphRepository(driver, database=settings.neo4j_database)
         repo.ensure_constraints()
-        app.state.graph_backend = "aura"
+        if settings.neo4j_vector_search:
+            repo.ensure_vector_index(settings.neo4j_vector_dimensions)
         return repo, driver
     except Exception as exc:  # pragma: no cover - handle offline graph
         logger.warning("Neo4j Aura unavailable (%s); using in-memory graph store", exc)
@@ -120,7 +162,6 @@ def _init_graph_repo(settings):
                 driver.close()
             except Exception:  # pragma: no cover - defensive cleanup
                 pass
-        app.state.graph_backend = "inmemory"
         return InMemoryGraphRepository(), None
 
 
@@ -135,8 +176,8 @@ def _initial_provider_key(settings) -> str:
     return "ollama"
 
 
-def _set_active_provider(provider_key: str, *, settings=None) -> ProviderContext:
-    settings = settings or getattr(app.state, "settings", SETTINGS)
+def _set_active_provider(app: FastAPI, provider_key: str, *, settings=None) -> ProviderContext:
+    settings = settings or app.state.settings
     normalized = (provider_key or "stub").lower()
     context = build_provider_context(settings, normalized)
     app.state.provider = context.provider
@@ -145,14 +186,14 @@ def _set_active_provider(provider_key: str, *, settings=None) -> ProviderContext
     return context
 
 
-def _resolve_provider_context(override: Optional[str], settings) -> ProviderContext:
+def _resolve_provider_context(app: FastAPI, override: Optional[str], settings) -> ProviderContext:
     if override:
         return build_provider_context(settings, override)
     existing = getattr(app.state, "provider_context", None)
     if isinstance(existing, ProviderContext):
         return existing
     active_key = getattr(app.state, "active_provider_key", None) or _initial_provider_key(settings)
-    return _set_active_provider(active_key, settings=settings)
+    return _set_active_provider(app, active_key, settings=settings)
 
 
 def _require_admin_secret(request: Request, settings) -> None:
@@ -164,24 +205,22 @@ def _require_admin_secret(request: Request, settings) -> None:
         raise HTTPException(status_code=403, detail="Forbidden")
 
 
-_set_active_provider(_initial_provider_key(SETTINGS), settings=SETTINGS)
-
-
-@app.on_event("startup")
-async def startup_event() -> None:  # pragma: no cover - exercised in integration tests
+def _startup(app: FastAPI) -> None:  # pragma: no cover - exercised in integration tests
     """Initialise application state before serving requests."""
-    settings = get_settings()
-    app.state.settings = settings
+    settings = app.state.settings
     app.state.vector_store = _init_vector_store(settings)
     repo, driver = _init_graph_repo(settings)
     app.state.graph_repo = repo
     app.state.graph_driver = driver
-    _set_active_provider(getattr(app.state, "active_provider_key", None) or _initial_provider_key(settings), settings=settings)
+    app.state.graph_backend = "aura" if driver is not None else "inmemory"
+    _set_active_provider(app, getattr(app.state, "active_provider_key", None) or _initial_provider_key(settings), settings=settings)
 
 
-@app.on_event("shutdown")
-async def shutdown_event() -> None:  # pragma: no cover - exercised in integration tests
+def _shutdown(app: FastAPI) -> None:  # pragma: no cover - exercised in integration tests
     """Tear down external resources on application shutdown."""
+    repo = getattr(app.state, "graph_repo", None)
+    if repo is not None and hasattr(repo, "close"):
+        repo.close()
     driver = getattr(app.state, "graph_driver", None)
     if driver:
         driver.close()
@@ -201,7 +240,6 @@ class SpaStaticFiles(StaticFiles):
             return JSONResponse({"detail": "Not Found"}, status_code=404)
 
 
-@app.middleware("http")
 async def enforce_body_limit(
     request: Request, call_next: Callable[[Request], Awaitable[Response]]
 ) -> Response:
@@ -225,7 +263,6 @@ async def enforce_body_limit(
     return response
 
 
-@app.middleware("http")
 async def log_requests(
     request: Request, call_next: Callable[[Request], Awaitable[Response]]
 ) -> Response:
@@ -235,16 +272,35 @@ async def log_requests(
     return response
 
 
-@app.get("/health")
-def health() -> dict[str, object]:
+def get_graph_repo(request: Request) -> Optional[GraphRepo]:
+    """Return the app's graph repository; tests swap it via ``dependency_overrides``."""
+
+    return getattr(request.app.state, "graph_repo", None)
+
+
+def get_app_settings(request: Request) -> Settings:
+    """Return the app's settings; tests override them via ``dependency_overrides``."""
+
+    return request.app.state.settings
+
+
+@router.get("/health")
+def health(
+    request: Request,
+    graph_repo: Optional[GraphRepo] = Depends(get_graph_repo),
+    settings: Settings = Depends(get_app_settings),
+) -> dict[str, object]:
     """Return deployment health, reachability, and provider metadata."""
-    settings = getattr(app.state, "settings", SETTINGS)
-    provider_context = _resolve_provider_context(None, settings)
+    app = request.app
+    provider_context = _resolve_provider_context(app, None, settings)
     provider = provider_context.provider
     active_provider = getattr(app.state, "active_provider_key", _initial_provider_key(settings))
     vector_path, vector_exists = _vector_store_state(getattr(app.state, "vector_store", None), settings)
-    hosted_reachable = _probe_hosted(settings)
     graph_backend = getattr(app.state, "graph_backend", "inmemory")
+    hosted = _HEALTH_PROBES.submit(_probe_hosted, settings)
+    ollama = _HEALTH_PROBES.submit(_probe_ollama, settings)
+    llamacpp = _HEALTH_PROBES.submit(_probe_llamacpp, settings)
+    neo4j = _HEALTH_PROBES.submit(_probe_neo4j, graph_repo, graph_backend)
 
     return {
         "status": "ok",
@@ -254,40 +310,51 @@ def health() -> dict[str, object]:
         "provider_vendor": provider_context.vendor,
         "local_model_available": provider_context.local_model_available,
         "operator_message": provider_context.reason,
-        "hosted_reachable": hosted_reachable,
+        "hosted_reachable": hosted.result(),
         "hosted_model_name": getattr(settings, "hosted_model_name", None),
         "active_provider": active_provider,
         "active_model": provider_context.model_name,
         "graph_backend": graph_backend,
         "preferred_local_models": [choice for choice, _ in SMALL_OLLAMA_MODELS],
-        "ollama_reachable": _probe_ollama(settings),
-        "llamacpp_reachable": _probe_llamacpp(settings),
-        "neo4j_reachable": _probe_neo4j(getattr(app.state, "graph_repo", None), graph_backend),
+        "ollama_reachable": ollama.result(),
+        "llamacpp_reachable": llamacpp.result(),
+        "neo4j_reachable": neo4j.result(),
         "vector_store_path": vector_path,
         "vector_store_path_exists": vector_exists,
     }
 
 
-@app.post("/ingest/paste", response_model=IngestPasteResponse)
-def ingest_paste(request: IngestPasteRequest) -> IngestPasteResponse:
+@router.post("/ingest/paste", response_model=IngestPasteResponse)
+def ingest_paste(
+    payload: IngestPasteRequest,
+    request: Request,
+    graph_repo: Optional[GraphRepo] = Depends(get_graph_repo),
+    settings: Settings = Depends(get_app_settings),
+) -> IngestPasteResponse:
     """Ingest pasted text content via the standard pipeline."""
-    if len(request.text.encode("utf-8")) > MAX_INGEST_BYTES:
+    if len(payload.text.encode("utf-8")) > MAX_INGEST_BYTES:
         raise HTTPException(status_code=413, detail="Payload too large")
 
-    settings = get_settings()
+    state = request.app.state
     embedding_provider = _safe_embedding_provider(settings)
     service = IngestService(
         settings=settings,
-        vector_store=app.state.vector_store,
-        graph_repo=app.state.graph_repo,
+        vector_store=state.vector_store,
+        graph_repo=graph_repo,
         embedding_provider=embedding_provider,
     )
-    response = service.ingest_text(request.title, request.text)
+    response = service.ingest_text(payload.title, payload.text)
     return response
 
 
-@app.post("/ingest/pdf", response_model=IngestPdfResponse)
-async def ingest_pdf(file: UploadFile = File(...), title: Optional[str] = None) -> IngestPdfResponse:
+@router.post("/ingest/pdf", response_model=IngestPdfResponse)
+async def ingest_pdf(
+    request: Request,
+    file: UploadFile = File(...),
+    title: Optional[str] = None,
+    graph_repo: Optional[GraphRepo] = Depends(get_graph_repo),
+    settings: Settings = Depends(get_app_settings),
+) -> IngestPdfResponse:
     """Accept a PDF upload, extract text, and index it."""
     if file.content_type not in {"application/pdf", "application/octet-stream"}:
         raise HTTPException(status_code=415, detail="Unsupported file type")
@@ -295,12 +362,12 @@ async def ingest_pdf(file: UploadFile = File(...), title: Optional[str] = None)
     if len(content) > MAX_INGEST_BYTES:
         raise HTTPException(status_code=413, detail="Payload too large")
 
-    settings = get_settings()
+    state = request.app.state
     embedding_provider = _safe_embedding_provider(settings)
     service = IngestService(
         settings=settings,
-        vector_store=app.state.vector_store,
-        graph_repo=app.state.graph_repo,
+        vector_store=state.vector_store,
+        graph_repo=graph_repo,
         embedding_provider=embedding_provider,
     )
     try:
@@ -310,11 +377,16 @@ async def ingest_pdf(file: UploadFile = File(...), title: Optional[str] = None)
     return result
 
 
-@app.post("/ask", response_model=AskResponse)
-def ask(payload: AskRequest) -> AskResponse:
+@router.post("/ask", response_model=AskResponse)
+def ask(
+    payload: AskRequest,
+    request: Request,
+    graph_repo: Optional[GraphRepo] = Depends(get_graph_repo),
+    settings: Settings = Depends(get_app_settings),
+) -> AskResponse:
     """Execute retrieval, provider selection, and response composition."""
-    settings = getattr(app.state, "settings", SETTINGS)
-    planner = Planner(settings=settings, graph_repo=app.state.graph_repo)
+    app = request.app
+    planner = Planner(settings=settings, graph_repo=graph_repo)
     plan = planner.plan(payload.question)
     top_k = payload.top_k or plan.get("top_k", settings.top_k)
 
@@ -322,7 +394,7 @@ def ask(payload: AskRequest) -> AskResponse:
     retriever = Retriever(
         settings=settings,
         vector_store=app.state.vector_store,
-        graph_repo=app.state.graph_repo,
+        graph_repo=graph_repo,
         embedding_provider=embedding_provider,
     )
 
@@ -336,18 +408,22 @@ def ask(payload: AskRequest) -> AskResponse:
     else:
         contexts = retriever.vector_search(payload.question, top_k)
 
-    provider_context = _resolve_provider_context(payload.provider_override, settings)
+    provider_context = _resolve_provider_context(app, payload.provider_override, settings)
     responder = Responder(settings=settings, provider=provider_context.provider)
     response = responder.answer(payload.question, plan, contexts)
     return response
 
 
-@app.post("/admin/provider")
-def set_active_provider(selection: ProviderToggleRequest, request: Request) -> dict[str, object]:
+@router.post("/admin/provider")
+def set_active_provider(
+    selection: ProviderToggleRequest,
+    request: Request,
+    settings: Settings = Depends(get_app_settings),
+) -> dict[str, object]:
     """Switch the active local provider, enforcing the admin secret."""
-    settings = getattr(app.state, "settings", SETTINGS)
+    app = request.app
     _require_admin_secret(request, settings)
-    context = _set_active_provider(selection.provider, settings=settings)
+    context = _set_active_provider(app, selection.provider, settings=settings)
     return {
         "active_provider": app.state.active_provider_key,
         "model_name": context.model_name,
@@ -357,16 +433,21 @@ def set_active_provider(selection: ProviderToggleRequest, request: Request) -> d
     }
 
 
-@app.post("/ingest/url", response_model=IngestUrlResponse)
-def ingest_url(request: IngestUrlRequest) -> IngestUrlResponse:
+@router.post("/ingest/url", response_model=IngestUrlResponse)
+def ingest_url(
+    payload: IngestUrlRequest,
+    request: Request,
+    graph_repo: Optional[GraphRepo] = Depends(get_graph_repo),
+    settings: Settings = Depends(get_app_settings),
+) -> IngestUrlResponse:
     """Ingest content discovered by crawling a single URL."""
-    settings = get_settings()
+    state = request.app.state
     if not settings.allow_url_ingest:
         raise HTTPException(status_code=403, detail="URL ingestion is disabled")
 
     limits = CrawlLimits(
-        max_depth=request.max_depth if request.max_depth is not None else settings.url_max_depth,
-        max_pages=request.max_pages if request.max_pages is not None else settings.url_max_pages,
+        max_depth=payload.max_depth if payload.max_depth is not None else settings.url_max_depth,
+        max_pages=payload.max_pages if payload.max_pages is not None else settings.url_max_pages,
         max_total_chars=settings.url_max_total_chars,
         rate_limit_sec=settings.url_rate_limit_sec,
     )
@@ -375,14 +456,14 @@ def ingest_url(request: IngestUrlRequest) -> IngestUrlResponse:
 
     started = time.perf_counter()
     try:
-        crawl_result = crawl_url(request.url, settings=settings, overrides=limits)
+        crawl_result = crawl_url(payload.url, settings=settings, overrides=limits)
     except CrawlError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
     service = IngestService(
         settings=settings,
-        vector_store=app.state.vector_store,
-        graph_repo=app.state.graph_repo,
+        vector_store=state.vector_store,
+        graph_repo=graph_repo,
         embedding_provider=_safe_embedding_provider(settings),
     )
 
@@ -417,13 +498,36 @@ def _safe_embedding_provider(settings):
         return StubEmbeddingProvider()
 
 
-def _probe_hosted(settings) -> bool | None:
-    api_key = getattr(settings, "groq_api_key", None)
-    api_url = getattr(settings, "groq_api_url", "")
-    if not api_key or not api_url:
-        return False
-    url = _groq_models_url(api_url)
-    headers = {"Authorization": f"Bearer {api_key}"}
+def _ttl_cache(ttl: float) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Memoise a function on its (hashable) arguments for ``ttl`` seconds."""
+
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        entries: dict[tuple, Tuple[float, T]] = {}
+        lock = threading.Lock()
+
+        @wraps(func)
+        def wrapper(*args):
+            now = time.monotonic()
+            with lock:
+                cached = entries.get(args)
+            if cached is not None and cached[0] > now:
+                return cached[1]
+            value = func(*args)
+            with lock:
+                for key in [key for key, (expires, _) in entries.items() if expires <= now]:
+                    del entries[key]
+                entries[args] = (now + ttl, value)
+            return value
+
+        wrapper.cache_clear = entries.clear  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
+
+
+@_ttl_cache(_PROBE_TTL_S)
+def _http_reachable(url: str, api_key: str | None = None) -> bool:
+    headers = {"Authorization": f"Bearer {api_key}"} if api_key else None
     try:
         response = requests.get(url, headers=headers, timeout=1)
         response.raise_for_status()
@@ -432,6 +536,14 @@ def _probe_hosted(settings) -> bool | None:
         return False
 
 
+def _probe_hosted(settings) -> bool | None:
+    api_key = getattr(settings, "groq_api_key", None)
+    api_url = getattr(settings, "groq_api_url", "")
+    if not api_key or not api_url:
+        return False
+    return _http_reachable(_groq_models_url(api_url), api_key)
+
+
 def _groq_models_url(api_url: str) -> str:
     if not api_url:
         return ""
@@ -448,26 +560,15 @@ def _groq_models_url(api_url: str) -> str:
 
 def _probe_ollama(settings) -> bool:
     host = getattr(settings, "ollama_host", "http://localhost:11434")
-    url = f"{host.rstrip('/')}/api/tags"
-    try:
-        response = requests.get(url, timeout=1)
-        response.raise_for_status()
-        return True
-    except requests.RequestException:  # pragma: no cover - network-dependent
-        return False
+    return _http_reachable(f"{host.rstrip('/')}/api/tags")
 
 
 def _probe_llamacpp(settings) -> bool:
     host = getattr(settings, "llamacpp_host", "http://localhost:8080")
-    url = f"{host.rstrip('/')}/health"
-    try:
-        response = requests.get(url, timeout=1)
-        response.raise_for_status()
-        return True
-    except requests.RequestException:  # pragma: no cover - network-dependent
-        return False
+    return _http_reachable(f"{host.rstrip('/')}/health")
 
 
+@_ttl_cache(_PROBE_TTL_S)
 def _probe_neo4j(graph_repo, backend: str) -> bool:
     if graph_repo is None or backend != "aura":
         return False
@@ -489,5 +590,4 @@ def _vector_store_state(vector_store, settings) -> Tuple[str, bool]:
     return str(store_path), store_path.exists()
 
 
-if FRONTEND_DIST.exists():
-    app.mount("/", SpaStaticFiles(directory=str(FRONTEND_DIST), html=True), name="frontend")
+app = create_app()
@@ -3,6 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Dict, List
 
+from backend.app.adapters.embeddings import EmbeddingProvider
 from backend.app.services.entities import extract_entities
 
 
@@ -12,7 +13,7 @@ class Retriever:
     settings: object
     vector_store: object
     graph_repo: object
-    embedding_provider: object
+    embedding_provider: EmbeddingProvider
 
     def vector_search(self, question: str, top_k: int) -> List[Dict[str, object]]:
         """Return top-k chunks ranked purely by vector similarity."""
@@ -21,18 +22,19 @@ class Retriever:
 
     def graph_search(self, question: str, top_k: int) -> List[Dict[str, object]]:
         """Fetch chunks linked to question entities from the graph store."""
-        entities = extract_entities([{"text": question}])
-        if not entities:
-            return []
-        degrees = self.graph_repo.get_entity_degrees(entities)
-        relevant = [name for name, degree in degrees.items() if degree > 0]
-        if not relevant:
-            return []
-        return self.graph_repo.fetch_chunks_for_entities(relevant, top_k)
+        return self._graph_chunks(self._linked_entities(question), top_k)
 
     def hybrid_search(self, question: str, top_k: int) -> List[Dict[str, object]]:
         """Blend graph-anchored recall with vector ranking as a fallback."""
-        graph_results = self.graph_search(question, top_k)
+        relevant = self._linked_entities(question)
+        fused_enabled = getattr(self.settings, "neo4j_vector_search", False)
+        if relevant and fused_enabled and hasattr(self.graph_repo, "hybrid_search"):
+            embedding = self.embedding_provider.embed_texts([question])[0]
+            fused = self.graph_repo.hybrid_search(embedding, relevant, top_k)
+            if fused:
+                return fused
+
+        graph_results = self._graph_chunks(relevant, top_k)
         if not graph_results:
             return self.vector_search(question, top_k)
 
@@ -40,3 +42,17 @@ class Retriever:
         vector_results = self.vector_search(question, top_k)
         filtered = [item for item in vector_results if item["id"] in allowed_ids]
         return filtered or vector_results
+
+    def _graph_chunks(self, relevant: List[str], top_k: int) -> List[Dict[str, object]]:
+        """Fetch chunks for already-resolved question entities."""
+        if not relevant:
+            return []
+        return self.graph_repo.fetch_chunks_for_entities(relevant, top_k)
+
+    def _linked_entities(self, question: str) -> List[str]:
+        """Return question entities that have at least one edge in the graph."""
+        entities = extract_entities([{"text": question}])
+        if not entities:
+            return []
+        degrees = self.graph_repo.get_entity_degrees(entities)
+        return [name for name, degree in degrees.items() if degree > 0]
@@ -2,27 +2,39 @@ from __future__ import annotations
 
 import os
 import re
-from typing import List, Dict
+from functools import lru_cache
+from typing import List, TypedDict
 
 TOKEN_APPROX_CHARS = 4
 DEFAULT_CHUNK_TOKENS = 512
 DEFAULT_CHUNK_OVERLAP = 64
+_WORD_RE = re.compile(r"\S+")
 
 
+class TextChunk(TypedDict):
+    """One chunk produced by split_text."""
+
+    id: str
+    text: str
+    ord: int
+    tokens: int
+
+
+@lru_cache(maxsize=4096)
 def approx_tokens(text: str) -> int:
     """Return a deterministic approximation of token count."""
     stripped = text.strip()
     if not stripped:
         return 0
     # Simple heuristic: mix words and characters to keep fairly stable across inputs.
-    word_count = len(re.findall(r"\S+", stripped))
+    word_count = len(_WORD_RE.findall(stripped))
     char_estimate = max(1, len(stripped) // TOKEN_APPROX_CHARS)
     return max(word_count, char_estimate)
 
 
-def split_text(text: str, chunk_tokens: int | None = None, overlap: int | None = None) -> List[Dict[str, object]]:
+def split_text(text: str, chunk_tokens: int | None = None, overlap: int | None = None) -> List[TextChunk]:
     """Split raw text into chunk dictionaries with token metadata."""
-    tokens = re.findall(r"\S+", text)
+    tokens = _WORD_RE.findall(text)
     if not tokens:
         return []
 
@@ -36,7 +48,7 @@ def split_text(text: str, chunk_tokens: int | None = None, overlap: int | None =
     if chunk_overlap >= chunk_size:
         chunk_overlap = max(0, chunk_size // 2)
 
-    chunks: List[Dict[str, object]] = []
+    chunks: List[TextChunk] = []
     start = 0
     index = 0
     while start < len(tokens):
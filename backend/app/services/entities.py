@@ -34,5 +34,5 @@ def extract_entities(chunks: Iterable[Mapping[str, object]]) -> List[str]:
         words = re.findall(r"\b[A-Za-z]{4,}\b", combined)
         candidates.extend(words)
 
-    normalized = {candidate.strip().lower() for candidate in candidates if candidate.strip()}
+    normalized = {candidate.lower() for candidate in map(str.strip, candidates) if candidate}
     return sorted(normalized)
@@ -3,12 +3,24 @@ from __future__ import annotations
 import logging
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from dataclasses import dataclass
 from io import BytesIO
-from typing import Iterable, List, Mapping, Optional
+from typing import Iterable, List, Mapping, Optional, Tuple
 
 from pdfminer.high_level import extract_text
 
+try:  # pragma: no cover - optional faster PDF backend
+    import pymupdf
+except ImportError:  # pragma: no cover - pdfminer remains the default extractor
+    pymupdf = None
+
+try:  # pragma: no cover - optional pure-Python fast path ahead of pdfminer
+    import pypdf
+except ImportError:  # pragma: no cover - pdfminer handles every PDF without it
+    pypdf = None
+
 from backend.app.adapters.embeddings import StubEmbeddingProvider
 from backend.app.models.dto import IngestPasteResponse, IngestPdfResponse
 from backend.app.services.chunking import approx_tokens, split_text
@@ -16,6 +28,8 @@ from backend.app.services.entities import extract_entities
 
 logger = logging.getLogger("service-desk")
 
+_VECTOR_WRITER = ThreadPoolExecutor(max_workers=4, thread_name_prefix="vector-upsert")
+
 
 @dataclass
 class IngestService:
@@ -44,52 +58,72 @@ class IngestService:
             )
 
         doc_id = uuid.uuid4().hex
-        chunk_texts: List[str] = []
-        records: List[Mapping[str, object]] = []
-        for chunk in chunks:
-            chunk_id = f"{doc_id}-{chunk['ord']}"
-            chunk["chunk_id"] = chunk_id
-            chunk["id"] = chunk_id
-            chunk_text = str(chunk["text"])
-            chunk_texts.append(chunk_text)
-            chunk["metadata"] = {"doc_id": doc_id, "ord": chunk["ord"]}
+        ords: List[int] = [chunk["ord"] for chunk in chunks]
+        texts: List[str] = [chunk["text"] for chunk in chunks]
+        ids: List[str] = [f"{doc_id}-{ord_}" for ord_ in ords]
+        metas: List[Mapping[str, object]] = [{"doc_id": doc_id, "ord": ord_} for ord_ in ords]
+        token_counts: List[int] = [approx_tokens(chunk_text) for chunk_text in texts]
 
         try:
-            embeddings = self.embedding_provider.embed_texts(chunk_texts)
+            embeddings = self.embedding_provider.embed_texts(texts)
         except Exception as exc:  # pragma: no cover - runtime specific
             logger.warning("Embedding provider failed (%s); falling back to stub embeddings", exc)
             fallback = StubEmbeddingProvider()
-            embeddings = fallback.embed_texts(chunk_texts)
+            embeddings = fallback.embed_texts(texts)
             self.embedding_provider = fallback
-        for chunk, embedding in zip(chunks, embeddings):
-            records.append(
-                {
-                    "id": chunk["chunk_id"],
-                    "text": chunk["text"],
-                    "metadata": chunk.get("metadata", {}),
-                    "embedding": embedding,
-                }
-            )
-
-        self.vector_store.upsert(records)
-
-        self.graph_repo.upsert_document(doc_id, title=title)
-        for chunk in chunks:
-            self.graph_repo.upsert_chunk(
-                doc_id,
-                chunk["chunk_id"],
-                ord=chunk["ord"],
-                text=str(chunk["text"]),
-                token_count=approx_tokens(str(chunk["text"])),
+        records: List[Mapping[str, object]] = [
+            {"id": chunk_id, "text": chunk_text, "metadata": meta, "embedding": embedding}
+            for chunk_id, chunk_text, meta, embedding in zip(
+                ids, texts, metas, embeddings, strict=True
             )
-            self.graph_repo.link_doc_chunk(doc_id, chunk["chunk_id"])
+        ]
 
-        entities = extract_entities(chunks)
-        for entity in entities:
-            entity_id = self.graph_repo.upsert_entity(entity)
-            for chunk in chunks:
-                if entity in str(chunk["text"]).lower():
-                    self.graph_repo.link_chunk_entity(chunk["chunk_id"], entity_id)
+        # Chroma and the graph store are independent; overlap their writes.
+        vector_write = _VECTOR_WRITER.submit(self.vector_store.upsert, records)
+        batch = getattr(self.graph_repo, "batch", None)
+        try:
+            with batch() if batch is not None else nullcontext():
+                self.graph_repo.upsert_document(doc_id, title=title)
+                chunk_rows = [
+                    {
+                        "id": chunk_id,
+                        "doc_id": doc_id,
+                        "ord": ord_,
+                        "text": chunk_text,
+                        "tokens": token_count,
+                    }
+                    for chunk_id, ord_, chunk_text, token_count in zip(
+                        ids, ords, texts, token_counts, strict=True
+                    )
+                ]
+                if getattr(self.settings, "neo4j_vector_search", False):
+                    for row, embedding in zip(chunk_rows, embeddings, strict=True):
+                        row["embedding"] = list(embedding)
+                self.graph_repo.upsert_chunks_batch(chunk_rows)
+
+                entities = extract_entities(chunks)
+                lowered = [chunk_text.lower() for chunk_text in texts]
+                entity_ids = self.graph_repo.upsert_entities_batch(
+                    [{"name": entity} for entity in entities]
+                )
+                self.graph_repo.link_chunk_entities_batch(
+                    [
+                        {"chunk_id": chunk_id, "entity_id": entity_id}
+                        for entity, entity_id in zip(entities, entity_ids, strict=True)
+                        for chunk_id, chunk_lower in zip(ids, lowered, strict=True)
+                        if entity in chunk_lower
+                    ]
+                )
+        except Exception:
+            # Surface the graph failure; a concurrent vector failure is secondary and only logged.
+            try:
+                vector_write.result()
+            except Exception as vector_exc:
+                logger.warning(
+                    "Vector upsert also failed during graph write failure (%s)", vector_exc
+                )
+            raise
+        vector_write.result()
 
         elapsed_ms = int((time.perf_counter() - started) * 1000)
         return IngestPasteResponse(
@@ -103,8 +137,7 @@ class IngestService:
         """Ingest a PDF document by extracting text then delegating to ingest_text."""
 
         started = time.perf_counter()
-        text = extract_text(BytesIO(data))
-        page_count = text.count("\f") + 1 if text else 0
+        text, page_count = _extract_pdf_text(data)
         result = self.ingest_text(title=title, text=text)
         elapsed_ms = int((time.perf_counter() - started) * 1000)
         return IngestPdfResponse(
@@ -114,3 +147,34 @@ class IngestService:
             vector_count=result.vector_count,
             ms=elapsed_ms,
         )
+
+
+def _extract_pdf_text(data: bytes) -> Tuple[str, int]:
+    """Return PDF text and page count, preferring PyMuPDF, then pypdf, then pdfminer."""
+
+    page_count: Optional[int] = None
+    if pymupdf is not None:  # pragma: no cover - optional dependency
+        try:
+            with pymupdf.open(stream=data, filetype="pdf") as doc:
+                page_count = doc.page_count
+                text = "\f".join(page.get_text() for page in doc)
+        except Exception as exc:
+            logger.warning("PyMuPDF failed to parse PDF (%s); falling back", exc)
+            text = ""
+        # Image-only pages yield no text; keep PyMuPDF's page count and let the fallbacks try.
+        if text.strip() and page_count is not None:
+            return text, page_count
+    if pypdf is not None:  # pragma: no cover - optional dependency
+        try:
+            pages = pypdf.PdfReader(BytesIO(data)).pages
+            text = "\f".join(page.extract_text() or "" for page in pages)
+        except Exception as exc:  # malformed PDFs raise ValueError/KeyError/struct.error too
+            logger.warning("pypdf failed to parse PDF (%s); falling back to pdfminer", exc)
+            text = ""
+        # Image-only or unusual encodings yield nothing here; pdfminer gets the final say.
+        if text.strip():
+            return text, len(pages)
+    text = extract_text(BytesIO(data))
+    if page_count is not None:
+        return text, page_count
+    return text, text.count("\f") + 1 if text else 0
@@ -3,18 +3,42 @@
 from __future__ import annotations
 
 import hashlib
+import threading
 import time
-from collections import deque
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import lru_cache, partial
 from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
 from urllib.parse import ParseResult, urljoin, urlparse, urlsplit, urlunsplit
 from urllib.robotparser import RobotFileParser
 
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:  # pragma: no cover - optional C-backed HTML parser
+    import lxml  # noqa: F401
+
+    _HTML_PARSER = "lxml"
+except ImportError:  # pragma: no cover - stdlib parser remains the default
+    _HTML_PARSER = "html.parser"
 
 from backend.app.core.config import Settings
 
+_POOL_MAXSIZE = 16
+# Only transient gateway statuses are retried; connect/read timeouts fail fast so a dead host
+# costs one timeout per page, not three.
+_RETRY = Retry(
+    total=2,
+    connect=0,
+    read=0,
+    backoff_factor=0.3,
+    status_forcelist=(502, 503, 504),
+    allowed_methods=("GET",),
+)
+
 
 @dataclass
 class CrawlLimits:
@@ -48,6 +72,65 @@ class CrawlError(Exception):
     """Raised when URL ingestion cannot proceed."""
 
 
+@dataclass
+class _CachedPage:
+    """Response-like copy of a fetched body replayed when the origin answers 304."""
+
+    url: str
+    text: str
+    headers: Dict[str, str]
+    etag: str
+    last_modified: str
+    status_code: int = 200
+
+    def validators(self) -> Dict[str, str]:
+        """Return the conditional request headers for this cached copy."""
+
+        headers: Dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class _ConditionalCache:
+    """Bounded, lock-guarded LRU of revalidatable pages shared by every crawler in the process."""
+
+    def __init__(self, maxsize: int = 256) -> None:
+        """Create an empty cache holding at most ``maxsize`` pages."""
+        self._maxsize = maxsize
+        self._pages: "OrderedDict[str, _CachedPage]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[_CachedPage]:
+        """Return the cached page for ``url`` and mark it recently used."""
+
+        with self._lock:
+            page = self._pages.get(url)
+            if page is not None:
+                self._pages.move_to_end(url)
+            return page
+
+    def put(self, url: str, page: _CachedPage) -> None:
+        """Store ``page``, evicting the least recently used entry when full."""
+
+        with self._lock:
+            self._pages[url] = page
+            self._pages.move_to_end(url)
+            while len(self._pages) > self._maxsize:
+                self._pages.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached page."""
+
+        with self._lock:
+            self._pages.clear()
+
+
+_CONDITIONAL_CACHE = _ConditionalCache()
+
+
 class UrlCrawler:
     """Same-origin crawler that respects robots, limits, and rate controls."""
 
@@ -56,7 +139,7 @@ class UrlCrawler:
     def __init__(self, settings: Settings, session: Optional[requests.Session] = None) -> None:
         """Store configuration and instantiate an HTTP session if needed."""
         self._settings = settings
-        self._session = session or requests.Session()
+        self._session = session or _new_session()
         self._session.headers.setdefault("User-Agent", self.USER_AGENT)
 
     def crawl(self, root_url: str, overrides: Optional[CrawlLimits] = None) -> CrawlResult:
@@ -77,8 +160,60 @@ class UrlCrawler:
         total_chars = 0
         result = CrawlResult()
         last_fetch = 0.0
+        # Rate-limited crawls stay strictly sequential so the delay keeps its meaning.
+        workers = 1 if limits.rate_limit_sec > 0 else self._concurrency()
+        executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            while queue and len(result.pages) < limits.max_pages:
+                wave = self._next_wave(
+                    queue, seen_urls, result, robot_parser, limits,
+                    min(workers, limits.max_pages - len(result.pages)),
+                )
+                if not wave:
+                    break
+                if executor is not None and len(wave) > 1:
+                    urls = [url for url, _ in wave]
+                    responses = list(executor.map(partial(self._safe_get, remember=False), urls))
+                    # Workers only read the conditional cache; writes happen here, on one thread.
+                    for url, response in zip(urls, responses):
+                        if response is not None:
+                            _remember_response(url, response)
+                else:
+                    last_fetch = self._respect_rate_limit(last_fetch, limits.rate_limit_sec)
+                    responses = [self._safe_get(wave[0][0])]
+                for (current_url, depth), response in zip(wave, responses):
+                    if len(result.pages) >= limits.max_pages:
+                        break
+                    added = self._handle_page(
+                        current_url, depth, response, parsed_root, limits, queue,
+                        seen_urls, seen_hashes, total_chars, result,
+                    )
+                    if added is None:
+                        return result
+                    total_chars += added
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False)
+        return result
 
-        while queue and len(result.pages) < limits.max_pages:
+    def _concurrency(self) -> int:
+        """Return how many pages may be fetched at once."""
+
+        return max(1, int(getattr(self._settings, "url_concurrency", 1)))
+
+    def _next_wave(
+        self,
+        queue: Deque[Tuple[str, int]],
+        seen_urls: Set[str],
+        result: CrawlResult,
+        robot_parser: RobotFileParser,
+        limits: CrawlLimits,
+        size: int,
+    ) -> List[Tuple[str, int]]:
+        """Pop up to ``size`` fetchable URLs off the queue in BFS order."""
+
+        wave: List[Tuple[str, int]] = []
+        while queue and len(wave) < size:
             current_url, depth = queue.popleft()
             if current_url in seen_urls:
                 continue
@@ -92,53 +227,66 @@ class UrlCrawler:
                 result.skipped_urls.append(current_url)
                 continue
 
-            last_fetch = self._respect_rate_limit(last_fetch, limits.rate_limit_sec)
-            response = self._safe_get(current_url)
-            if response is None:
-                result.skipped_urls.append(current_url)
-                continue
-
-            content_type = response.headers.get("Content-Type", "").lower()
-            if "text/html" not in content_type:
-                result.skipped_urls.append(current_url)
-                continue
-
-            html = response.text
-            page_url = self._normalize_url(response.url or current_url)
-            parsed_page = urlparse(page_url)
-            if parsed_page.scheme != parsed_root.scheme or parsed_page.netloc != parsed_root.netloc:
-                result.skipped_urls.append(page_url)
-                continue
-
-            soup = BeautifulSoup(html, "html.parser")
-            canonical_url = self._canonical_url(soup, page_url)
-            if canonical_url != current_url and canonical_url in seen_urls:
-                continue
-
-            text, title = self._extract_text_and_title(soup, canonical_url)
-            if not text:
-                continue
-
-            text_hash = hashlib.sha1(text.encode("utf-8")).hexdigest()
-            if text_hash in seen_hashes:
-                continue
-            seen_hashes.add(text_hash)
-
-            if total_chars + len(text) > limits.max_total_chars:
-                break
-
-            result.pages.append(CrawledPage(url=canonical_url, title=title or canonical_url, content=text))
-            total_chars += len(text)
-            result.pages_visited += 1
-            seen_urls.add(canonical_url)
+            wave.append((current_url, depth))
+        return wave
+
+    def _handle_page(
+        self,
+        current_url: str,
+        depth: int,
+        response: Optional[requests.Response],
+        parsed_root: ParseResult,
+        limits: CrawlLimits,
+        queue: Deque[Tuple[str, int]],
+        seen_urls: Set[str],
+        seen_hashes: Set[str],
+        total_chars: int,
+        result: CrawlResult,
+    ) -> Optional[int]:
+        """Record a fetched page and enqueue its links; return chars added or None at the cap."""
+
+        if response is None:
+            result.skipped_urls.append(current_url)
+            return 0
+
+        content_type = response.headers.get("Content-Type", "").lower()
+        if "text/html" not in content_type:
+            result.skipped_urls.append(current_url)
+            return 0
+
+        html = response.text
+        page_url, page_scheme, page_netloc = _split_normalized(response.url or current_url)
+        if page_scheme != parsed_root.scheme or page_netloc != parsed_root.netloc:
+            result.skipped_urls.append(page_url)
+            return 0
+
+        soup = BeautifulSoup(html, _HTML_PARSER)
+        canonical_url = self._canonical_url(soup, page_url)
+        if canonical_url != current_url and canonical_url in seen_urls:
+            return 0
+
+        text, title = self._extract_text_and_title(soup, canonical_url)
+        if not text:
+            return 0
+
+        text_hash = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        if text_hash in seen_hashes:
+            return 0
+        seen_hashes.add(text_hash)
+
+        if total_chars + len(text) > limits.max_total_chars:
+            return None
 
-            if depth < limits.max_depth and len(result.pages) < limits.max_pages:
-                links = self._extract_same_origin_links(soup, canonical_url, parsed_root)
-                for link in links:
-                    if link not in seen_urls:
-                        queue.append((link, depth + 1))
+        result.pages.append(CrawledPage(url=canonical_url, title=title or canonical_url, content=text))
+        result.pages_visited += 1
+        seen_urls.add(canonical_url)
 
-        return result
+        if depth < limits.max_depth and len(result.pages) < limits.max_pages:
+            links = self._extract_same_origin_links(soup, canonical_url, parsed_root)
+            for link in links:
+                if link not in seen_urls:
+                    queue.append((link, depth + 1))
+        return len(text)
 
     def _default_limits(self) -> CrawlLimits:
         """Construct CrawlLimits using application settings."""
@@ -156,7 +304,7 @@ class UrlCrawler:
         robots_url = urlunsplit((parsed_root.scheme, parsed_root.netloc, "/robots.txt", "", ""))
         parser = RobotFileParser()
         try:
-            response = self._session.get(robots_url, timeout=5)
+            response = self._conditional_get(robots_url, timeout=5)
             if response.status_code >= 400:
                 parser.parse([])
             else:
@@ -185,23 +333,37 @@ class UrlCrawler:
             time.sleep(wait)
         return time.monotonic()
 
-    def _safe_get(self, url: str) -> Optional[requests.Response]:
+    def _safe_get(self, url: str, remember: bool = True) -> Optional[requests.Response]:
         """Perform a GET request handling exceptions and non-200 codes."""
 
         try:
-            response = self._session.get(url, timeout=10)
+            response = self._conditional_get(url, timeout=10, remember=remember)
             if response.status_code != 200:
                 return None
             return response
         except requests.RequestException:
             return None
 
+    def _conditional_get(
+        self, url: str, timeout: float, remember: bool = True
+    ) -> requests.Response:
+        """GET a URL, revalidating with ETag/Last-Modified when a cached copy exists."""
+
+        cached = _CONDITIONAL_CACHE.get(url)
+        if cached is None:
+            response = self._session.get(url, timeout=timeout)
+        else:
+            response = self._session.get(url, timeout=timeout, headers=cached.validators())
+            if response.status_code == 304:
+                return cached  # type: ignore[return-value]
+        if remember:
+            _remember_response(url, response)
+        return response
+
     def _normalize_url(self, url: str) -> str:
         """Return a normalised URL suitable for deduplication."""
 
-        parsed = urlsplit(url)
-        normalized = urlunsplit((parsed.scheme, parsed.netloc, parsed.path or "/", "", ""))
-        return normalized.rstrip("/") or normalized
+        return _split_normalized(url)[0]
 
     def _canonical_url(self, soup: BeautifulSoup, fallback_url: str) -> str:
         """Resolve a canonical URL from the page when provided."""
@@ -246,15 +408,53 @@ class UrlCrawler:
             href = anchor.get("href", "").strip()
             if not href:
                 continue
-            joined = urljoin(base_url, href)
-            normalized = self._normalize_url(joined)
-            parsed = urlparse(normalized)
-            if parsed.scheme != parsed_root.scheme or parsed.netloc != parsed_root.netloc:
+            normalized, scheme, netloc = _split_normalized(urljoin(base_url, href))
+            if scheme != parsed_root.scheme or netloc != parsed_root.netloc:
                 continue
             collected.add(normalized)
         return collected
 
 
+def _new_session() -> requests.Session:
+    """Return a keep-alive session with pooled, retrying adapters for both schemes."""
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=_POOL_MAXSIZE, max_retries=_RETRY)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@lru_cache(maxsize=4096)
+def _split_normalized(url: str) -> Tuple[str, str, str]:
+    """Return the normalised URL together with its scheme and netloc."""
+
+    parsed = urlsplit(url)
+    normalized = urlunsplit((parsed.scheme, parsed.netloc, parsed.path or "/", "", ""))
+    return normalized.rstrip("/") or normalized, parsed.scheme, parsed.netloc
+
+
+def _remember_response(url: str, response: requests.Response) -> None:
+    """Cache a successful response body when the origin supplied validators."""
+
+    if response.status_code != 200:
+        return
+    etag = response.headers.get("ETag") or ""
+    last_modified = response.headers.get("Last-Modified") or ""
+    if not etag and not last_modified:
+        return
+    _CONDITIONAL_CACHE.put(
+        url,
+        _CachedPage(
+            url=response.url or url,
+            text=response.text,
+            headers={"Content-Type": response.headers.get("Content-Type", "")},
+            etag=etag,
+            last_modified=last_modified,
+        ),
+    )
+
+
 def crawl_url(root_url: str, settings: Settings, overrides: Optional[CrawlLimits] = None) -> CrawlResult:
     """Convenience helper constructing a UrlCrawler and invoking crawl."""
 
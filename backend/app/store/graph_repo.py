@@ -1,8 +1,31 @@
 from __future__ import annotations
 
 import re
-from typing import Any, Callable, Dict, Iterable, List, MutableMapping, Optional, Sequence, Set, Tuple, TypeVar
-from typing import TYPE_CHECKING
+import sys
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    DefaultDict,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
 
 if TYPE_CHECKING:  # pragma: no cover - import is for type checking only
     from neo4j import Driver, Session, Transaction
@@ -13,35 +36,144 @@ else:  # pragma: no cover - runtime driver types resolved dynamically
 
 T = TypeVar("T")
 ChunkRecord = Dict[str, object]
+ChunkRow = Tuple[Any, ...]
+Row = Mapping[str, object]
+
+_REL_RE = re.compile(r"^[A-Z_][A-Z0-9_]*$")
+_VECTOR_INDEX = "chunk_embeddings"
+_VECTOR_OVERSAMPLE = 5
+
+# Cypher is kept as fixed, parameterised text so Neo4j can reuse cached query plans.
+# Each uniqueness constraint is backed by a range index on ``id``, which is what lets
+# ``e.id IN $ids`` and the MERGEs plan as index seeks instead of label scans.
+# Keyed by (label, property, backs a constraint) rather than by name: databases bootstrapped
+# before the schema was named carry auto-generated names for the same constraints.
+_CYPHER_SCHEMA = {
+    ("Document", "id", True): (
+        "CREATE CONSTRAINT document_id IF NOT EXISTS FOR (d:Document) REQUIRE d.id IS UNIQUE"
+    ),
+    ("Chunk", "id", True): (
+        "CREATE CONSTRAINT chunk_id IF NOT EXISTS FOR (c:Chunk) REQUIRE c.id IS UNIQUE"
+    ),
+    ("Entity", "id", True): (
+        "CREATE CONSTRAINT entity_id IF NOT EXISTS FOR (e:Entity) REQUIRE e.id IS UNIQUE"
+    ),
+    ("Entity", "name", False): (
+        "CREATE INDEX entity_name IF NOT EXISTS FOR (e:Entity) ON (e.name)"
+    ),
+}
+# Constraint-backing indexes are listed too, so one catalog read covers both kinds.
+_CYPHER_SHOW_SCHEMA = "SHOW INDEXES YIELD labelsOrTypes, properties, owningConstraint"
+_CYPHER_VECTOR_INDEX = (
+    f"CREATE VECTOR INDEX {_VECTOR_INDEX} IF NOT EXISTS "
+    "FOR (c:Chunk) ON (c.embedding) "
+    "OPTIONS {indexConfig: {`vector.dimensions`: $dimensions, "
+    "`vector.similarity_function`: 'cosine'}}"
+)
+_CYPHER_UPSERT_DOCUMENT = (
+    "MERGE (d:Document {id: $doc_id}) "
+    "SET d.title = $title, d.source = $source, d.updated_at = timestamp()"
+)
+# MERGE the parent so a chunk is never dropped when its Document has not been written yet;
+# upsert_document fills in the title and source whenever it runs.
+_CYPHER_UPSERT_CHUNKS = (
+    "UNWIND $rows AS r "
+    "MERGE (d:Document {id: r.doc_id}) "
+    "MERGE (c:Chunk {id: r.id}) "
+    "SET c.ord = r.ord, c.text = r.text, c.tokens = r.tokens, c.updated_at = timestamp(), "
+    "c.embedding = coalesce(r.embedding, c.embedding) "
+    "MERGE (d)-[:HAS_CHUNK]->(c)"
+)
+_CYPHER_LINK_DOC_CHUNKS = (
+    "MATCH (d:Document {id: $doc_id}) "
+    "UNWIND $chunk_ids AS chunk_id "
+    "MATCH (c:Chunk {id: chunk_id}) "
+    "MERGE (d)-[:HAS_CHUNK]->(c)"
+)
+_CYPHER_UPSERT_ENTITIES = (
+    "UNWIND $rows AS r "
+    "MERGE (e:Entity {id: r.id}) "
+    "SET e.name = r.name, e.type = coalesce(r.type, 'TERM'), e.updated_at = timestamp()"
+)
+_CYPHER_LINK_CHUNK_ENTITIES = (
+    "UNWIND $rows AS r "
+    "MATCH (c:Chunk {{id: r.chunk_id}}), (e:Entity {{id: r.entity_id}}) "
+    "MERGE (c)-[:{rel}]->(e)"
+)
+_CYPHER_ENTITY_DEGREES = (
+    "MATCH (e:Entity) WHERE e.id IN $ids "
+    "RETURN e.id AS id, COUNT { (e)--() } AS degree"
+)
+_CYPHER_CHUNKS_FOR_ENTITIES = (
+    "UNWIND $ids AS eid "
+    "MATCH (:Entity {id: eid})<-[:ABOUT]-(c:Chunk)<-[:HAS_CHUNK]-(d:Document) "
+    "WITH DISTINCT c, d ORDER BY d.updated_at DESC LIMIT $limit "
+    "RETURN c.id AS chunk_id, c.text AS text, c.ord AS ord, d.id AS doc_id, d.title AS title"
+)
+_CYPHER_HYBRID_SEARCH = (
+    "CALL db.index.vector.queryNodes($index, $candidates, $embedding) YIELD node AS c, score "
+    "MATCH (c)-[:ABOUT]->(e:Entity) WHERE e.id IN $ids "
+    "MATCH (d:Document)-[:HAS_CHUNK]->(c) "
+    "WITH DISTINCT c, d, score ORDER BY score DESC LIMIT $limit "
+    "RETURN c.id AS chunk_id, c.text AS text, c.ord AS ord, d.id AS doc_id, "
+    "d.title AS title, score"
+)
+_CYPHER_PING = "RETURN 1 AS ok"
+_FETCH_CACHE_SIZE = 1024
+# Local writes invalidate the cache once they commit; writes from other processes or
+# workers are only picked up when the TTL bucket rolls over, so this bounds that staleness.
+_FETCH_CACHE_TTL_S = 10.0
 
 
 class GraphRepository:
     """Persistence adapter for document, chunk, and entity metadata in Neo4j."""
 
-    def __init__(self, driver: Driver) -> None:
-        """Store the Neo4j driver for subsequent transactional work."""
+    def __init__(self, driver: Driver, database: Optional[str] = None) -> None:
+        """Store the Neo4j driver and target database for subsequent transactional work."""
         self._driver: Driver = driver
+        self._database = database
+        self._local = threading.local()
+        self._sessions: List[Session] = []
+        self._sessions_lock = threading.Lock()
+        self._generation = 0
+        self._fetch_chunk_rows = lru_cache(maxsize=_FETCH_CACHE_SIZE)(self._query_chunk_rows)
 
     def ensure_constraints(self) -> None:
-        """Create Neo4j constraints and indexes required for ingest operations."""
-
-        statements = [
-            "CREATE CONSTRAINT IF NOT EXISTS FOR (d:Document) REQUIRE d.id IS UNIQUE",
-            "CREATE CONSTRAINT IF NOT EXISTS FOR (c:Chunk) REQUIRE c.id IS UNIQUE",
-            "CREATE CONSTRAINT IF NOT EXISTS FOR (e:Entity) REQUIRE e.id IS UNIQUE",
-            "CREATE INDEX IF NOT EXISTS FOR (e:Entity) ON (e.name)",
-        ]
-        with self._driver.session() as session:
-            for statement in statements:
-                session.run(statement)
+        """Create whichever Neo4j constraints and indexes the catalog does not list yet."""
+
+        def _existing(tx: Transaction) -> Set[Tuple[str, str, bool]]:
+            return {
+                (label, prop, record["owningConstraint"] is not None)
+                for record in tx.run(_CYPHER_SHOW_SCHEMA)
+                for label in record["labelsOrTypes"] or ()
+                for prop in record["properties"] or ()
+            }
+
+        existing = self._execute_read(_existing)
+        missing = [ddl for key, ddl in _CYPHER_SCHEMA.items() if key not in existing]
+        if not missing:
+            return
+
+        def _tx(tx: Transaction) -> None:
+            for statement in missing:
+                tx.run(statement)
+
+        self._execute_write(_tx)
+
+    def ensure_vector_index(self, dimensions: int) -> None:
+        """Create the cosine vector index over chunk embeddings used by hybrid_search."""
+
+        def _tx(tx: Transaction) -> None:
+            tx.run(_CYPHER_VECTOR_INDEX, dimensions=dimensions)
+
+        self._execute_write(_tx)
 
     def upsert_document(self, doc_id: str, title: Optional[str] = None, source: str = "paste") -> None:
         """Insert or update a document node and basic metadata."""
 
         def _tx(tx: Transaction) -> None:
             tx.run(
-                "MERGE (d:Document {id: $doc_id}) "
-                "SET d.title = $title, d.source = $source, d.updated_at = timestamp()",
+                _CYPHER_UPSERT_DOCUMENT,
                 doc_id=doc_id,
                 title=title,
                 source=source,
@@ -50,29 +182,41 @@ class GraphRepository:
         self._execute_write(_tx)
 
     def upsert_chunk(self, doc_id: str, chunk_id: str, ord: int, text: str, token_count: int) -> None:
-        """Insert or update a chunk node with ordering and token metadata."""
+        """Insert or update a chunk node and link it to its document."""
+
+        self.upsert_chunks_batch(
+            [{"id": chunk_id, "doc_id": doc_id, "ord": ord, "text": text, "tokens": token_count}]
+        )
+
+    def upsert_chunks_batch(self, rows: Sequence[Row]) -> None:
+        """Insert or update many chunk nodes and their document edges in one UNWIND statement."""
+
+        batch = [dict(row) for row in rows]
+        if not batch:
+            return
 
         def _tx(tx: Transaction) -> None:
-            tx.run(
-                "MERGE (c:Chunk {id: $chunk_id}) "
-                "SET c.ord = $ord, c.text = $text, c.tokens = $token_count, c.updated_at = timestamp()",
-                chunk_id=chunk_id,
-                ord=ord,
-                text=text,
-                token_count=token_count,
-            )
+            tx.run(_CYPHER_UPSERT_CHUNKS, rows=batch)
 
         self._execute_write(_tx)
 
     def link_doc_chunk(self, doc_id: str, chunk_id: str) -> None:
         """Ensure the relationship between a document and one of its chunks exists."""
 
+        self.link_doc_chunks_batch(doc_id, [chunk_id])
+
+    def link_doc_chunks_batch(self, doc_id: str, chunk_ids: Sequence[str]) -> None:
+        """Ensure HAS_CHUNK edges from a document to many existing chunks in one statement."""
+
+        ids = list(chunk_ids)
+        if not ids:
+            return
+
         def _tx(tx: Transaction) -> None:
             tx.run(
-                "MATCH (d:Document {id: $doc_id}), (c:Chunk {id: $chunk_id}) "
-                "MERGE (d)-[:HAS_CHUNK]->(c)",
+                _CYPHER_LINK_DOC_CHUNKS,
                 doc_id=doc_id,
-                chunk_id=chunk_id,
+                chunk_ids=ids,
             )
 
         self._execute_write(_tx)
@@ -80,34 +224,37 @@ class GraphRepository:
     def upsert_entity(self, name: str, type: str = "TERM") -> str:
         """Insert or update an entity node, returning its canonical identifier."""
 
-        def _tx(tx: Transaction) -> str:
-            result = tx.run(
-                "MERGE (e:Entity {id: toLower($name)}) "
-                "SET e.name = $name, e.type = $type, e.updated_at = timestamp() "
-                "RETURN e.id AS id",
-                name=name,
-                type=type,
-            )
-            record = result.single()
-            return record["id"] if record else name.lower()
+        return self.upsert_entities_batch([{"name": name, "type": type}])[0]
+
+    def upsert_entities_batch(self, rows: Sequence[Row]) -> List[str]:
+        """Insert or update many entity nodes, returning their canonical identifiers."""
+
+        batch = _entity_rows(rows)
+        if not batch:
+            return []
+
+        def _tx(tx: Transaction) -> None:
+            tx.run(_CYPHER_UPSERT_ENTITIES, rows=batch)
 
-        result = self._execute_write(_tx)
-        if isinstance(result, str):
-            return result
-        return str(result)
+        self._execute_write(_tx)
+        return [str(row["id"]) for row in batch]
 
     def link_chunk_entity(self, chunk_id: str, entity_id: str, rel: str = "ABOUT") -> None:
         """Create a relationship between a chunk and an entity."""
 
-        rel_type = _safe_rel(rel)
+        self.link_chunk_entities_batch([{"chunk_id": chunk_id, "entity_id": entity_id}], rel=rel)
+
+    def link_chunk_entities_batch(self, pairs: Sequence[Row], rel: str = "ABOUT") -> None:
+        """Create many chunk→entity relationships with a single UNWIND statement."""
+
+        batch = [dict(pair) for pair in pairs]
+        if not batch:
+            return
+
+        statement = _link_chunk_entities_cypher(rel)
 
         def _tx(tx: Transaction) -> None:
-            tx.run(
-                f"MATCH (c:Chunk {{id: $chunk_id}}), (e:Entity {{id: $entity_id}}) "
-                f"MERGE (c)-[:{rel_type}]->(e)",
-                chunk_id=chunk_id,
-                entity_id=entity_id,
-            )
+            tx.run(statement, rows=batch)
 
         self._execute_write(_tx)
 
@@ -118,19 +265,17 @@ class GraphRepository:
         if not name_list:
             return {}
 
-        lower_names = [name.lower() for name in name_list]
+        lower_names = [_entity_id(name) for name in name_list]
 
         def _tx(tx: Transaction) -> Dict[str, int]:
-            result = tx.run(
-                "MATCH (e:Entity) WHERE e.id IN $ids "
-                "OPTIONAL MATCH (e)--(n) "
-                "RETURN e.id AS id, count(n) AS degree",
-                ids=lower_names,
-            )
+            result = tx.run(_CYPHER_ENTITY_DEGREES, ids=lower_names)
             return {record["id"]: record["degree"] for record in result}
 
         degrees = self._execute_read(_tx)
-        return {name: degrees.get(name.lower(), 0) for name in name_list}
+        return {
+            name: degrees.get(lower, 0)
+            for name, lower in zip(name_list, lower_names, strict=True)
+        }
 
     def fetch_chunks_for_entities(self, names: Sequence[str], limit: int) -> List[ChunkRecord]:
         """Fetch chunks connected to any of the provided entity names."""
@@ -138,39 +283,71 @@ class GraphRepository:
         if not names:
             return []
 
-        lower_names = [name.lower() for name in names]
+        ids = frozenset(_entity_id(name) for name in names)
+        ttl_bucket = int(time.monotonic() // _FETCH_CACHE_TTL_S)
+        if getattr(self._local, "tx", None) is not None:
+            # Reads inside an open batch see uncommitted writes; never cache those.
+            rows = self._query_chunk_rows(ids, limit, self._generation, ttl_bucket)
+        else:
+            rows = self._fetch_chunk_rows(ids, limit, self._generation, ttl_bucket)
+        return [_row_to_record(row) for row in rows]
+
+    def hybrid_search(
+        self, query_embedding: Sequence[float], names: Sequence[str], top_k: int
+    ) -> List[ChunkRecord]:
+        """Return the chunks nearest to the embedding that mention any of the given entities."""
+
+        if not names or top_k <= 0:
+            return []
 
         def _tx(tx: Transaction) -> List[ChunkRecord]:
             result = tx.run(
-                "MATCH (e:Entity) WHERE e.id IN $ids "
-                "MATCH (e)<-[:ABOUT]-(c:Chunk)<-[:HAS_CHUNK]-(d:Document) "
-                "RETURN c.id AS chunk_id, c.text AS text, c.ord AS ord, d.id AS doc_id, d.title AS title",
-                ids=lower_names,
+                _CYPHER_HYBRID_SEARCH,
+                index=_VECTOR_INDEX,
+                candidates=top_k * _VECTOR_OVERSAMPLE,
+                embedding=list(query_embedding),
+                ids=[_entity_id(name) for name in names],
+                limit=top_k,
             )
             records: List[ChunkRecord] = []
             for record in result:
-                records.append(
-                    {
-                        "id": record["chunk_id"],
-                        "text": record["text"],
-                        "metadata": {
-                            "doc_id": record["doc_id"],
-                            "title": record.get("title"),
-                            "ord": record.get("ord"),
-                        },
-                        "score": 0.0,
-                    }
-                )
+                chunk = _row_to_record(_chunk_row(record))
+                # Neo4j reports similarity in [0, 1]; keep Chroma's lower-is-closer convention.
+                chunk["score"] = 1.0 - float(record["score"])
+                records.append(chunk)
             return records
 
-        records = self._execute_read(_tx)
-        return records[:limit]
+        return self._execute_read(_tx)
+
+    def _query_chunk_rows(
+        self, ids: FrozenSet[str], limit: int, generation: int, ttl_bucket: int
+    ) -> Tuple[ChunkRow, ...]:
+        """Run the entity→chunk query; generation and ttl_bucket only key the cache."""
+
+        def _tx(tx: Transaction) -> Tuple[ChunkRow, ...]:
+            result = tx.run(
+                _CYPHER_CHUNKS_FOR_ENTITIES,
+                ids=list(ids),
+                limit=limit,
+            )
+            return tuple(_chunk_row(record) for record in result)
+
+        return self._execute_read(_tx)
+
+    def _invalidate_fetch_cache(self) -> None:
+        """Bump the generation so cached entity→chunk lookups are no longer hit.
+
+        Called only once a write has finished, so a read racing the write can at worst
+        cache pre-write rows under the generation that is about to be retired.
+        """
+
+        self._generation += 1
 
     def ping(self) -> bool:
         """Return True when the database responds to a trivial read."""
 
         def _tx(tx: Transaction) -> bool:
-            tx.run("RETURN 1 AS ok")
+            tx.run(_CYPHER_PING)
             return True
 
         try:
@@ -178,20 +355,95 @@ class GraphRepository:
         except Exception:  # pragma: no cover - depends on runtime connectivity
             return False
 
+    def close(self) -> None:
+        """Close the sessions cached by this repository; the driver is owned by the caller."""
+
+        with self._sessions_lock:
+            sessions, self._sessions = self._sessions, []
+        self._local = threading.local()
+        for session in sessions:
+            try:
+                session.close()
+            except Exception:  # pragma: no cover - defensive cleanup
+                pass
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Run every repository call on this thread inside one transaction, committed on exit."""
+
+        if getattr(self._local, "tx", None) is not None:
+            yield
+            return
+        with self._session() as session:
+            tx = session.begin_transaction()
+            self._local.tx = tx
+            self._local.dirty = False
+            try:
+                yield
+                tx.commit()
+            except Exception:
+                tx.rollback()
+                raise
+            finally:
+                self._local.tx = None
+                tx.close()
+                if self._local.dirty:
+                    self._invalidate_fetch_cache()
+
+    @contextmanager
+    def _session(self) -> Iterator[Session]:
+        """Yield the calling thread's cached session, opening it on first use."""
+
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._driver.session(database=self._database)
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions.append(session)
+        try:
+            yield session
+        except Exception:
+            self._discard_session(session)
+            raise
+
+    def _discard_session(self, session: Session) -> None:
+        """Drop a session that raised so the next call starts from a clean one."""
+
+        self._local.session = None
+        with self._sessions_lock:
+            if session in self._sessions:
+                self._sessions.remove(session)
+        try:
+            session.close()
+        except Exception:  # pragma: no cover - defensive cleanup
+            pass
+
     def _execute_write(self, func: Callable[[Transaction], T]) -> T:
         """Execute a write transaction using the best available driver API."""
 
-        if hasattr(self._driver, "execute_write"):
-            return self._driver.execute_write(func)
-        with self._driver.session() as session:  # pragma: no cover - legacy driver path
-            return session.execute_write(func)  # type: ignore[call-arg]
+        tx = getattr(self._local, "tx", None)
+        if tx is not None:
+            # batch() invalidates once the enclosing transaction has committed.
+            self._local.dirty = True
+            return func(tx)
+        try:
+            if hasattr(self._driver, "execute_write"):
+                return self._driver.execute_write(func)
+            with self._session() as session:
+                return session.execute_write(func)  # type: ignore[call-arg]
+        finally:
+            # Invalidate even on failure: a failed commit may still have been applied.
+            self._invalidate_fetch_cache()
 
     def _execute_read(self, func: Callable[[Transaction], T]) -> T:
         """Execute a read transaction using the best available driver API."""
 
+        tx = getattr(self._local, "tx", None)
+        if tx is not None:
+            return func(tx)
         if hasattr(self._driver, "execute_read"):
             return self._driver.execute_read(func)
-        with self._driver.session() as session:  # pragma: no cover - legacy driver path
+        with self._session() as session:
             return session.execute_read(func)  # type: ignore[call-arg]
 
 
@@ -203,60 +455,98 @@ class InMemoryGraphRepository:
         self.documents: MutableMapping[str, Dict[str, Optional[str]]] = {}
         self.chunks: MutableMapping[str, Dict[str, Any]] = {}
         self.entity_links: MutableMapping[str, Dict[str, Any]] = {}
+        self.entity_chunks: DefaultDict[str, Set[str]] = defaultdict(set)
 
     def ensure_constraints(self) -> None:  # pragma: no cover - no-op for in-memory variant
         """In-memory store has no constraints to create."""
 
+    def close(self) -> None:  # pragma: no cover - no-op for in-memory variant
+        """In-memory store holds no sessions to release."""
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """In-memory writes apply immediately; there is no transaction to group."""
+
+        yield
+
     def upsert_document(self, doc_id: str, title: Optional[str] = None, source: str = "paste") -> None:
         """Store document metadata in-memory."""
 
-        self.documents[doc_id] = {"title": title, "source": source}
+        self.documents[_intern_key(doc_id)] = {"title": title, "source": source}
 
     def upsert_chunk(self, doc_id: str, chunk_id: str, ord: int, text: str, token_count: int) -> None:
         """Persist chunk metadata in-memory for testing."""
 
-        self.chunks[chunk_id] = {
-            "doc_id": doc_id,
-            "text": text,
-            "ord": ord,
-            "tokens": token_count,
-        }
+        self.upsert_chunks_batch(
+            [{"id": chunk_id, "doc_id": doc_id, "ord": ord, "text": text, "tokens": token_count}]
+        )
+
+    def upsert_chunks_batch(self, rows: Sequence[Row]) -> None:
+        """Persist many chunk rows in-memory."""
+
+        for row in rows:
+            self.chunks[_intern_key(str(row["id"]))] = {
+                "doc_id": _intern_key(str(row["doc_id"])),
+                "text": row["text"],
+                "ord": row.get("ord"),
+                "tokens": row.get("tokens"),
+            }
 
     def link_doc_chunk(self, doc_id: str, chunk_id: str) -> None:  # pragma: no cover - no-op
         """Document/chunk relationships are implicit in the in-memory structure."""
 
+    def link_doc_chunks_batch(  # pragma: no cover - no-op
+        self, doc_id: str, chunk_ids: Sequence[str]
+    ) -> None:
+        """Document/chunk relationships are implicit in the in-memory structure."""
+
     def upsert_entity(self, name: str, type: str = "TERM") -> str:
         """Store entity metadata and return its normalized id."""
 
-        entity_id = name.lower()
-        if entity_id not in self.entity_links:
-            self.entity_links[entity_id] = {"name": name, "type": type, "chunks": set()}
-        return entity_id
+        return self.upsert_entities_batch([{"name": name, "type": type}])[0]
+
+    def upsert_entities_batch(self, rows: Sequence[Row]) -> List[str]:
+        """Store many entities and return their normalized ids in input order."""
+
+        ids: List[str] = []
+        for row in rows:
+            name = str(row["name"])
+            entity_id = _intern_key(_entity_id(name))
+            if entity_id not in self.entity_links:
+                self.entity_links[entity_id] = {"name": name, "type": row.get("type") or "TERM"}
+            ids.append(entity_id)
+        return ids
 
     def link_chunk_entity(self, chunk_id: str, entity_id: str, rel: str = "ABOUT") -> None:
         """Record a chunk→entity relationship in-memory."""
 
-        info = self.entity_links.setdefault(entity_id, {"name": entity_id, "type": "TERM", "chunks": set()})
-        chunks: Set[str] = info.setdefault("chunks", set())  # type: ignore[assignment]
-        chunks.add(chunk_id)
+        self.link_chunk_entities_batch([{"chunk_id": chunk_id, "entity_id": entity_id}], rel=rel)
+
+    def link_chunk_entities_batch(self, pairs: Sequence[Row], rel: str = "ABOUT") -> None:
+        """Record many chunk→entity relationships in-memory."""
+
+        for pair in pairs:
+            entity_id = _intern_key(str(pair["entity_id"]))
+            self.entity_links.setdefault(entity_id, {"name": entity_id, "type": "TERM"})
+            self.entity_chunks[entity_id].add(_intern_key(str(pair["chunk_id"])))
 
     def get_entity_degrees(self, names: Iterable[str]) -> Dict[str, int]:
         """Return entity linkage counts for the supplied names."""
 
-        degrees: Dict[str, int] = {}
-        for name in names:
-            entity_id = name.lower()
-            chunks = self.entity_links.get(entity_id, {"chunks": set()}).get("chunks", set())
-            degrees[name] = len(chunks)
-        return degrees
+        return {name: len(self.entity_chunks.get(_entity_id(name), ())) for name in names}
 
     def fetch_chunks_for_entities(self, names: Sequence[str], limit: int) -> List[ChunkRecord]:
         """Return stored chunks associated with the requested entities."""
 
         collected: List[ChunkRecord] = []
+        if limit <= 0:
+            return collected
+        seen: Set[str] = set()
         for name in names:
-            entity_id = name.lower()
-            for chunk_id in self.entity_links.get(entity_id, {"chunks": set()}).get("chunks", set()):
+            for chunk_id in self.entity_chunks.get(_entity_id(name), ()):
+                if chunk_id in seen:
+                    continue
+                seen.add(chunk_id)
                 chunk = self.chunks.get(chunk_id)
                 if not chunk:
                     continue
@@ -266,7 +556,9 @@ class InMemoryGraphRepository:
                     "ord": chunk.get("ord"),
                 }
                 collected.append({"id": chunk_id, "text": chunk["text"], "metadata": metadata, "score": 0.0})
-        return collected[:limit]
+                if len(collected) >= limit:
+                    return collected
+        return collected
 
     def ping(self) -> bool:
         """In-memory store is always available."""
@@ -274,10 +566,60 @@ class InMemoryGraphRepository:
         return True
 
 
+@lru_cache(maxsize=4096)
+def _entity_id(name: str) -> str:
+    """Return the canonical entity id: NFKC-normalised and case-folded."""
+
+    return unicodedata.normalize("NFKC", name).casefold()
+
+
+def _entity_rows(rows: Sequence[Row]) -> List[Dict[str, object]]:
+    """Copy entity rows, attaching the canonical id computed once in Python."""
+
+    return [{**row, "id": _entity_id(str(row["name"]))} for row in rows]
+
+
+def _intern_key(value: str) -> str:
+    """Intern ASCII identifiers so repeated in-memory keys share one string object."""
+
+    return sys.intern(value) if value.isascii() else value
+
+
+def _chunk_row(record: Any) -> ChunkRow:
+    """Freeze a Neo4j chunk record into an immutable, cacheable tuple."""
+
+    return (
+        record["chunk_id"],
+        record["text"],
+        record.get("ord"),
+        record["doc_id"],
+        record.get("title"),
+    )
+
+
+def _row_to_record(row: ChunkRow) -> ChunkRecord:
+    """Shape a frozen chunk row into the retriever's chunk record format."""
+
+    chunk_id, text, ord_, doc_id, title = row
+    return {
+        "id": chunk_id,
+        "text": text,
+        "metadata": {"doc_id": doc_id, "title": title, "ord": ord_},
+        "score": 0.0,
+    }
+
+
+@lru_cache(maxsize=32)
+def _link_chunk_entities_cypher(rel: str) -> str:
+    """Return the chunk→entity link statement for a sanitised relationship type."""
+
+    return _CYPHER_LINK_CHUNK_ENTITIES.format(rel=_safe_rel(rel))
+
+
 def _safe_rel(rel: str) -> str:
     """Return a Neo4j relationship label comprised of safe characters only."""
 
-    candidate = (rel or "ABOUT").upper()
-    if not re.match(r"^[A-Z_][A-Z0-9_]*$", candidate):
+    if not rel or rel == "ABOUT":
         return "ABOUT"
-    return candidate
+    candidate = rel.upper()
+    return candidate if _REL_RE.match(candidate) else "ABOUT"
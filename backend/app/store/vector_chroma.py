@@ -2,16 +2,21 @@ from __future__ import annotations
 
 import logging
 import os
+import threading
 from dataclasses import dataclass
-from typing import Dict, List, Protocol
+from itertools import islice
+from typing import Dict, List, Optional, Protocol, Tuple
 
 import chromadb
+import numpy as np
 from chromadb.config import Settings as ChromaSettings
 
 ChunkRecord = Dict[str, object]
 
 logger = logging.getLogger("service-desk")
 
+_UPSERT_BATCH_SIZE = 1000
+
 
 class VectorStore(Protocol):
     """Protocol describing the vector store interface used by the application."""
@@ -41,29 +46,20 @@ class VectorChromaStore:
         self._collection = self._client.get_or_create_collection(name=self.collection_name)
 
     def upsert(self, chunks: List[ChunkRecord]) -> None:
-        """Persist new or updated chunk embeddings."""
-
-        if not chunks:
-            return
-        ids = [chunk["id"] for chunk in chunks]
-        documents = [chunk.get("text", "") for chunk in chunks]
-        metadatas = [chunk.get("metadata", {}) for chunk in chunks]
-        embeddings = [chunk.get("embedding") for chunk in chunks]
+        """Persist new or updated chunk embeddings in bounded batches."""
+
+        batches = [
+            _batch_columns(chunks[start : start + _UPSERT_BATCH_SIZE])
+            for start in range(0, len(chunks), _UPSERT_BATCH_SIZE)
+        ]
         try:
-            self._collection.upsert(
-                ids=ids,
-                documents=documents,
-                metadatas=metadatas,
-                embeddings=embeddings,
-            )
+            for columns in batches:
+                self._collection.upsert(**columns)
         except TypeError as exc:
+            # The reset drops the whole collection, so replay every batch, not just the failed one.
             self._handle_metadata_corruption(exc)
-            self._collection.upsert(
-                ids=ids,
-                documents=documents,
-                metadatas=metadatas,
-                embeddings=embeddings,
-            )
+            for columns in batches:
+                self._collection.upsert(**columns)
 
     def search(self, query_embedding: List[float], top_k: int = 5) -> List[ChunkRecord]:
         """Query the store for the top-k most similar chunks."""
@@ -73,21 +69,21 @@ class VectorChromaStore:
         except TypeError as exc:
             self._handle_metadata_corruption(exc)
             return []
-        ids = results.get("ids", [[]])[0]
-        documents = results.get("documents", [[]])[0]
-        metadatas = results.get("metadatas", [[]])[0]
-        distances = results.get("distances", [[]])[0]
-        formatted: List[ChunkRecord] = []
-        for idx, chunk_id in enumerate(ids):
-            formatted.append(
-                {
-                    "id": chunk_id,
-                    "text": documents[idx] if idx < len(documents) else "",
-                    "metadata": metadatas[idx] if idx < len(metadatas) else {},
-                    "score": distances[idx] if idx < len(distances) else None,
-                }
+        # Chroma returns parallel per-query arrays for the default include set.
+        return [
+            {"id": chunk_id, "text": text, "metadata": metadata, "score": distance}
+            for chunk_id, text, metadata, distance in zip(
+                results["ids"][0],
+                results["documents"][0],
+                results["metadatas"][0],
+                results["distances"][0],
             )
-        return formatted
+        ]
+
+    def clear(self) -> None:
+        """Drop every record by recreating the collection on the already-open client."""
+
+        self._reset_collection()
 
     def ping(self) -> bool:
         """Return True when the underlying Chroma collection responds."""
@@ -134,19 +130,96 @@ class InMemoryVectorStore(VectorStore):
     def __init__(self) -> None:
         """Create an empty, deterministic in-memory record store."""
         self._records: Dict[str, ChunkRecord] = {}
+        self._index: Optional[Tuple[List[str], np.ndarray]] = None
+        # Upserts run on the ingest writer pool, so records and the cached index change together.
+        self._lock = threading.Lock()
 
     def upsert(self, chunks: List[ChunkRecord]) -> None:
         """Persist chunk embeddings into the in-memory dictionary."""
 
-        for chunk in chunks:
-            self._records[chunk["id"]] = chunk
+        with self._lock:
+            for chunk in chunks:
+                self._records[str(chunk["id"])] = chunk
+            if chunks:
+                self._index = None
 
-    def search(self, query_embedding: List[float], top_k: int = 5) -> List[ChunkRecord]:  # pragma: no cover - simple fallback
-        """Return the first N chunks; ignores the query embedding."""
+    def search(self, query_embedding: List[float], top_k: int = 5) -> List[ChunkRecord]:
+        """Return the top-k chunks nearest to the query embedding by L2 distance."""
 
-        return list(self._records.values())[:top_k]
+        if top_k <= 0:
+            return []
+        with self._lock:
+            if not self._records:
+                return []
+            ids, matrix = self._embedding_matrix()
+            query = np.asarray(query_embedding, dtype=np.float32)
+            if matrix.ndim != 2 or query.shape != matrix.shape[1:]:
+                # Missing or mixed-dimension embeddings: return the first top_k in insertion order.
+                return [
+                    _format_record(record, None)
+                    for record in islice(self._records.values(), top_k)
+                ]
+            distances = np.linalg.norm(matrix - query, axis=1)
+            return [
+                _format_record(self._records[ids[idx]], float(distances[idx]))
+                for idx in _nearest_indices(distances, top_k)
+            ]
 
     def ping(self) -> bool:
         """In-memory store is always reachable."""
 
         return True
+
+    def _embedding_matrix(self) -> Tuple[List[str], np.ndarray]:
+        """Stack stored embeddings into a float32 matrix, rebuilt only after upserts.
+
+        Callers must hold ``self._lock``.
+        """
+
+        if self._index is None:
+            ids = list(self._records)
+            try:
+                rows = [self._records[chunk_id].get("embedding") or [] for chunk_id in ids]
+                matrix = np.asarray(rows, dtype=np.float32)
+            except ValueError:
+                matrix = np.empty((0,), dtype=np.float32)
+            self._index = (ids, matrix)
+        return self._index
+
+
+def _batch_columns(chunks: List[ChunkRecord]) -> Dict[str, List[object]]:
+    """Split one batch of chunks into the parallel column lists Chroma expects."""
+
+    columns: Dict[str, List[object]] = {
+        "ids": [],
+        "documents": [],
+        "metadatas": [],
+        "embeddings": [],
+    }
+    for chunk in chunks:
+        columns["ids"].append(chunk["id"])
+        columns["documents"].append(chunk.get("text", ""))
+        columns["metadatas"].append(chunk.get("metadata", {}))
+        columns["embeddings"].append(chunk.get("embedding"))
+    return columns
+
+
+def _format_record(record: ChunkRecord, score: Optional[float]) -> ChunkRecord:
+    """Project a stored record onto the search result shape shared with Chroma."""
+
+    return {
+        "id": record["id"],
+        "text": record.get("text", ""),
+        "metadata": record.get("metadata", {}),
+        "score": score,
+    }
+
+
+def _nearest_indices(distances: np.ndarray, k: int) -> np.ndarray:
+    """Return indices of the k smallest distances in ascending order."""
+
+    if k < len(distances):
+        candidates = np.argpartition(distances, k)[:k]
+    else:
+        candidates = np.arange(len(distances))
+    return candidates[np.argsort(distances[candidates], kind="stable")]
@@ -2,13 +2,15 @@
 
 from __future__ import annotations
 
-import importlib
 import sys
 import types
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
+from contextlib import ExitStack
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict
 
+import numpy as np
 import pytest
 from fastapi.testclient import TestClient
 
@@ -37,6 +39,7 @@ if "chromadb" not in sys.modules:
     class _FakeCollection:
         def __init__(self):
             self._records: Dict[str, Dict[str, Any]] = {}
+            self._matrix = None
 
         def upsert(self, ids, documents, metadatas, embeddings):
             for idx, chunk_id in enumerate(ids):
@@ -46,21 +49,25 @@ if "chromadb" not in sys.modules:
                     "metadata": metadatas[idx] if idx < len(metadatas) else {},
                     "embedding": embeddings[idx] if idx < len(embeddings) else [],
                 }
+            self._matrix = None
 
         def query(self, query_embeddings, n_results):
-            query = query_embeddings[0]
-
-            def _dist(record):
-                embedding = record.get("embedding") or []
-                return sum((float(a) - float(b)) ** 2 for a, b in zip(query, embedding)) ** 0.5
-
-            ordered = sorted(self._records.values(), key=_dist)
-            top = ordered[:n_results]
+            records = list(self._records.values())
+            if not records:
+                return {"ids": [[]], "documents": [[]], "metadatas": [[]], "distances": [[]]}
+            if self._matrix is None:
+                self._matrix = np.asarray([rec["embedding"] for rec in records], dtype=np.float32)
+            query = np.asarray(query_embeddings[0], dtype=np.float32)
+            distances = np.linalg.norm(self._matrix - query, axis=1)
+            n_results = min(n_results, len(records))
+            idx = np.argpartition(distances, n_results - 1)[:n_results]
+            idx = idx[np.argsort(distances[idx], kind="stable")]
+            top = [records[i] for i in idx]
             return {
                 "ids": [[rec["id"] for rec in top]],
                 "documents": [[rec.get("text", "") for rec in top]],
                 "metadatas": [[rec.get("metadata", {}) for rec in top]],
-                "distances": [[_dist(rec) for rec in top]],
+                "distances": [[float(distances[i]) for i in idx]],
             }
 
         def count(self):  # noqa: D401 - mimic Chroma API
@@ -73,6 +80,9 @@ if "chromadb" not in sys.modules:
         def get_or_create_collection(self, name):  # noqa: D401 - mimic API
             return self._collection
 
+        def delete_collection(self, name):  # noqa: D401 - mimic API
+            self._collection = _FakeCollection()
+
     class _FakeSettings:
         def __init__(self, **_kwargs):  # pragma: no cover - placeholder
             return
@@ -84,34 +94,133 @@ if "chromadb" not in sys.modules:
     sys.modules.setdefault("chromadb.config", fake_config)
 
 
+@pytest.fixture(scope="session", autouse=True)
+def _cached_stub_embeddings() -> Iterator[None]:
+    """Memoise stub embeddings for the session; tests embed the same few texts repeatedly."""
+
+    from backend.app.adapters import embeddings
+
+    original = embeddings._stub_embed
+    cached = lru_cache(maxsize=None)(lambda text, dim: tuple(original(text, dim)))
+    with pytest.MonkeyPatch.context() as patcher:
+        # Hand out fresh lists so callers cannot mutate the cached vectors.
+        patcher.setattr(embeddings, "_stub_embed", lambda text, dim: list(cached(text, dim)))
+        yield
+
+
+@pytest.fixture(scope="session")
+def _base_app():
+    """Build the FastAPI app once; make_client resets its state for every test."""
+
+    import backend.app.main as main
+
+    return main.create_app()
+
+
+@pytest.fixture(scope="session")
+def _base_client(_base_app):
+    """Share one TestClient across the session; app startup and shutdown run once around it."""
+
+    import backend.app.main as main
+    from backend.app.store.graph_repo import InMemoryGraphRepository
+    from backend.app.store.vector_chroma import InMemoryVectorStore
+
+    with ExitStack() as stack:
+        # Startup must not open the developer's Chroma dir or Neo4j; tests reseed state anyway.
+        with pytest.MonkeyPatch.context() as patcher:
+            patcher.setattr(
+                main, "_init_graph_repo", lambda settings: (InMemoryGraphRepository(), None)
+            )
+            patcher.setattr(main, "_init_vector_store", lambda settings: InMemoryVectorStore())
+            client = stack.enter_context(TestClient(_base_app))
+        yield client
+
+
+@pytest.fixture(scope="session")
+def chroma_dir(tmp_path_factory) -> Path:
+    """Return the session's Chroma directory; tmp_path_factory keeps xdist workers apart."""
+
+    return tmp_path_factory.mktemp("chroma")
+
+
+@pytest.fixture(scope="session")
+def _chroma_store(chroma_dir):
+    """Open one persistent Chroma store for the whole session."""
+
+    from backend.app.store.vector_chroma import VectorChromaStore
+
+    return VectorChromaStore(path=str(chroma_dir))
+
+
 @pytest.fixture
-def make_client(monkeypatch) -> Callable[[Dict[str, Any]], TestClient]:
+def chroma_store(_chroma_store):
+    """Hand each test the shared Chroma store with its collection emptied."""
+
+    _chroma_store.clear()
+    return _chroma_store
+
+
+@pytest.fixture(scope="session")
+def _base_settings() -> Dict[str, Any]:
+    """Resolve env and .env once; make_client validates per-test overrides on top."""
+
+    return config_module.Settings().model_dump()
+
+
+def _seed_client(
+    patcher: pytest.MonkeyPatch,
+    app,
+    client: TestClient,
+    base_settings: Dict[str, Any],
+    chroma_dir: Path,
+    env: Dict[str, Any] | None,
+) -> TestClient:
+    """Apply env overrides through ``patcher``, reseed the shared app, and return its client."""
+
+    overrides = {"CHROMA_DIR": chroma_dir, **(env or {})}
+    values = dict(base_settings)
+    for key, value in overrides.items():
+        # Env is still patched for the few helpers that read os.environ directly.
+        if value is None:
+            patcher.delenv(key, raising=False)
+            values.pop(key.lower(), None)
+        else:
+            patcher.setenv(key, str(value))
+            values[key.lower()] = str(value)
+
+    # model_validate coerces the overrides without re-reading the environment.
+    settings = config_module.Settings.model_validate(values)
+    settings.log_dir.mkdir(parents=True, exist_ok=True)
+    settings.chroma_dir.mkdir(parents=True, exist_ok=True)
+
+    import backend.app.main as main
+
+    # _seed_state installs in-memory stores; startup already ran once on the shared client.
+    main._seed_state(app, settings)
+    return client
+
+
+@pytest.fixture
+def make_client(
+    monkeypatch, _base_app, _base_client, _base_settings, chroma_dir
+) -> Iterator[Callable[[Dict[str, Any]], TestClient]]:
     """Return a factory that builds a TestClient with env overrides."""
 
     def factory(env: Dict[str, Any] | None = None) -> TestClient:
-        overrides = dict(env or {})
-        use_real_repos = bool(overrides.pop("__use_real_repos", False))
-        for key, value in overrides.items():
-            if value is None:
-                monkeypatch.delenv(key, raising=False)
-            else:
-                monkeypatch.setenv(key, str(value))
-
-        # ensure settings pick up the latest environment
-        config_module.reload_settings()
-
-        import backend.app.main as main
-        importlib.reload(main)
-        if not use_real_repos:
-            from backend.app.store.graph_repo import InMemoryGraphRepository
-            from backend.app.store.vector_chroma import InMemoryVectorStore
-
-            main._init_graph_repo = lambda settings: (InMemoryGraphRepository(), None)  # type: ignore[attr-defined]
-            main._init_vector_store = lambda settings: InMemoryVectorStore()  # type: ignore[attr-defined]
-            main.app.state.vector_store = InMemoryVectorStore()
-            main.app.state.graph_repo = InMemoryGraphRepository()
-            main.app.state.graph_driver = None
-        client = TestClient(main.app)
-        return client
-
-    return factory
+        return _seed_client(monkeypatch, _base_app, _base_client, _base_settings, chroma_dir, env)
+
+    yield factory
+
+    # Leave the shared app neutral even when the test failed before or after seeding it.
+    import backend.app.main as main
+
+    _base_app.dependency_overrides.clear()
+    neutral = config_module.Settings.model_validate({**_base_settings, "model_provider": "stub"})
+    main._seed_state(_base_app, neutral)
+
+
+@pytest.fixture
+def stub_client(make_client) -> TestClient:
+    """Seed the shared client with stub model and embedding providers for one test."""
+
+    return make_client({"MODEL_PROVIDER": "stub", "EMBED_PROVIDER": "stub"})
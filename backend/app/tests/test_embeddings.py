@@ -11,3 +11,19 @@ def test_stub_embeddings_are_deterministic():
     assert len(first) == 2
     assert len(first[0]) == 384
     assert math.isclose(sum(first[0]), sum(second[0]))
+
+
+def test_stub_embeddings_are_unit_vectors_independent_of_batch():
+    provider = StubEmbeddingProvider(dim=16)
+    batch = provider.embed_texts(["alpha", "beta", "gamma"])
+    assert provider.embed_texts(["beta"])[0] == batch[1]
+    for vector in batch:
+        assert math.isclose(math.sqrt(sum(v * v for v in vector)), 1.0)
+    assert provider.embed_texts([]) == []
+
+
+def test_stub_embeddings_cache_returns_independent_lists():
+    provider = StubEmbeddingProvider(dim=8)
+    first = provider.embed_texts(["alpha"])[0]
+    first[0] = 42.0
+    assert provider.embed_texts(["alpha"])[0][0] != 42.0
@@ -2,47 +2,324 @@ from unittest.mock import MagicMock
 
 import pytest
 
-from backend.app.store.graph_repo import GraphRepository
+import backend.app.main as main
+from backend.app.core.config import Settings
+from backend.app.store.graph_repo import GraphRepository, InMemoryGraphRepository
 
 
-@pytest.fixture()
-def mock_driver():
-    return MagicMock()
+class FakeTx:
+    """Records every statement and answers chunk reads with canned rows."""
 
+    def __init__(self, read_rows=()):
+        self.runs = []
+        self._read_rows = read_rows
 
-def test_ensure_constraints_executes_statements(mock_driver):
-    repo = GraphRepository(mock_driver)
-    repo.ensure_constraints()
-    session = mock_driver.session.return_value.__enter__.return_value
-    assert session.run.call_count >= 3
-    first_query = session.run.call_args_list[0].args[0]
-    assert "CREATE CONSTRAINT" in first_query
+    def run(self, statement, **params):
+        self.runs.append((statement, params))
+        return list(self._read_rows)
+
+
+class FakeDriver:
+    """Minimal driver exposing execute_write/execute_read with explicit call logs."""
+
+    def __init__(self, read_rows=()):
+        self.writes = []
+        self.reads = []
+        self._read_rows = read_rows
+
+    def verify_connectivity(self):
+        return None
+
+    def execute_write(self, func):
+        tx = FakeTx()
+        self.writes.append(tx)
+        return func(tx)
 
+    def execute_read(self, func):
+        tx = FakeTx(self._read_rows)
+        self.reads.append(tx)
+        return func(tx)
 
-def test_upsert_document_invokes_write(mock_driver):
-    repo = GraphRepository(mock_driver)
+    def close(self):
+        return None
+
+
+@pytest.fixture()
+def fake_driver():
+    return FakeDriver()
+
+
+def test_ensure_constraints_executes_statements(fake_driver):
+    repo = GraphRepository(fake_driver)
+    repo.ensure_constraints()
+    assert len(fake_driver.writes) == 1
+    statements = [statement for statement, _ in fake_driver.writes[0].runs]
+    assert len(statements) >= 4
+    assert any(statement.startswith("CREATE CONSTRAINT") for statement in statements)
+    assert any(statement.startswith("CREATE INDEX") for statement in statements)
+    for label in ("document", "chunk", "entity"):
+        assert any(f"CONSTRAINT {label}_id " in statement for statement in statements)
+    assert fake_driver.reads[0].runs[0][0].startswith("SHOW INDEXES")
+
+
+def _index_row(label, prop, constraint=None):
+    return {"labelsOrTypes": [label], "properties": [prop], "owningConstraint": constraint}
+
+
+def test_ensure_constraints_skips_schema_already_in_catalog():
+    rows = [
+        _index_row("Document", "id", "document_id"),
+        _index_row("Chunk", "id", "chunk_id"),
+        _index_row("Entity", "id", "entity_id"),
+        _index_row("Entity", "name"),
+        _index_row("Chunk", "embedding"),
+        {"labelsOrTypes": None, "properties": None, "owningConstraint": None},
+    ]
+    driver = FakeDriver(read_rows=rows)
+    GraphRepository(driver).ensure_constraints()
+    assert len(driver.reads) == 1
+    assert driver.writes == []
+
+    driver = FakeDriver(read_rows=rows[:2])
+    GraphRepository(driver).ensure_constraints()
+    [write] = driver.writes
+    assert [statement.split()[2] for statement, _ in write.runs] == ["entity_id", "entity_name"]
+
+
+def test_ensure_constraints_accepts_auto_named_legacy_schema():
+    rows = [
+        _index_row("Document", "id", "constraint_3e1f7c2a"),
+        _index_row("Chunk", "id", "constraint_9b04d6e1"),
+        _index_row("Entity", "id", "constraint_51ac88f0"),
+        _index_row("Entity", "name"),
+    ]
+    driver = FakeDriver(read_rows=rows)
+    GraphRepository(driver).ensure_constraints()
+    assert driver.writes == []
+
+    # A plain index on Entity.id does not stand in for the uniqueness constraint.
+    driver = FakeDriver(read_rows=[*rows[:2], _index_row("Entity", "id"), rows[3]])
+    GraphRepository(driver).ensure_constraints()
+    [write] = driver.writes
+    assert [statement.split()[2] for statement, _ in write.runs] == ["entity_id"]
+
+
+def test_upsert_document_invokes_write(fake_driver):
+    repo = GraphRepository(fake_driver)
     repo.upsert_document("doc-1", title="Manual")
-    assert mock_driver.execute_write.called
+    assert len(fake_driver.writes) == 1
 
 
-def test_upsert_chunk_links_document(mock_driver):
-    repo = GraphRepository(mock_driver)
+def test_upsert_chunk_links_document(fake_driver):
+    repo = GraphRepository(fake_driver)
     repo.upsert_chunk("doc-1", "chunk-1", ord=0, text="Hello", token_count=10)
     repo.link_doc_chunk("doc-1", "chunk-1")
-    assert mock_driver.execute_write.call_count == 2
+    assert len(fake_driver.writes) == 2
 
 
-def test_upsert_entity_and_link(mock_driver):
-    repo = GraphRepository(mock_driver)
+def test_upsert_entity_and_link(fake_driver):
+    repo = GraphRepository(fake_driver)
     entity_id = repo.upsert_entity("Widget")
     repo.link_chunk_entity("chunk-1", entity_id)
-    assert mock_driver.execute_write.call_count == 2
+    assert entity_id == "widget"
+    assert len(fake_driver.writes) == 2
+    link_rows = fake_driver.writes[1].runs[0][1]["rows"]
+    assert link_rows == [{"chunk_id": "chunk-1", "entity_id": "widget"}]
+
+
+def test_chunk_batch_sends_single_unwind_statement(fake_driver):
+    repo = GraphRepository(fake_driver)
+    rows = [
+        {"id": f"doc-1-{ord_}", "doc_id": "doc-1", "ord": ord_, "text": "Hello", "tokens": 1}
+        for ord_ in range(5)
+    ]
+    repo.upsert_chunks_batch(rows)
+    assert len(fake_driver.writes) == 1
+
+    [(statement, params)] = fake_driver.writes[0].runs
+    assert statement.startswith("UNWIND $rows")
+    assert "MERGE (d:Document {id: r.doc_id})" in statement
+    assert params["rows"] == rows
+
+    repo.upsert_chunks_batch([])
+    assert len(fake_driver.writes) == 1
+
+
+def test_ensure_vector_index_passes_dimensions(fake_driver):
+    GraphRepository(fake_driver).ensure_vector_index(384)
+
+    [(statement, params)] = fake_driver.writes[0].runs
+    assert statement.startswith("CREATE VECTOR INDEX chunk_embeddings IF NOT EXISTS")
+    assert "FOR (c:Chunk) ON (c.embedding)" in statement
+    assert "`vector.similarity_function`: 'cosine'" in statement
+    assert params == {"dimensions": 384}
+
+
+def test_hybrid_search_runs_fused_query_and_flips_scores():
+    row = {
+        "chunk_id": "doc-1-0",
+        "text": "Reset MFA",
+        "ord": 0,
+        "doc_id": "doc-1",
+        "title": "Manual",
+        "score": 0.75,
+    }
+    driver = FakeDriver(read_rows=[row])
+    repo = GraphRepository(driver)
+
+    results = repo.hybrid_search([0.1, 0.2], ["MFA", "Reset"], top_k=3)
+
+    [(statement, params)] = driver.reads[0].runs
+    assert statement.startswith("CALL db.index.vector.queryNodes($index, $candidates, $embedding)")
+    assert "MATCH (c)-[:ABOUT]->(e:Entity) WHERE e.id IN $ids" in statement
+    assert params == {
+        "index": "chunk_embeddings",
+        "candidates": 15,
+        "embedding": [0.1, 0.2],
+        "ids": ["mfa", "reset"],
+        "limit": 3,
+    }
+    assert [item["id"] for item in results] == ["doc-1-0"]
+    assert results[0]["score"] == pytest.approx(0.25)
+    assert results[0]["metadata"] == {"doc_id": "doc-1", "title": "Manual", "ord": 0}
+
+    assert repo.hybrid_search([0.1, 0.2], [], top_k=3) == []
+    assert len(driver.reads) == 1
+
+
+def test_fetch_chunks_cached_until_next_write():
+    row = {
+        "chunk_id": "doc-1-0",
+        "text": "Reset MFA",
+        "ord": 0,
+        "doc_id": "doc-1",
+        "title": "Manual",
+    }
+    driver = FakeDriver(read_rows=[row])
+    repo = GraphRepository(driver)
+
+    first = repo.fetch_chunks_for_entities(["MFA", "Reset"], limit=5)
+    second = repo.fetch_chunks_for_entities(["reset", "mfa"], limit=5)
+    assert len(driver.reads) == 1
+    assert first == second
+    assert first[0]["metadata"] == {"doc_id": "doc-1", "title": "Manual", "ord": 0}
+    assert first[0] is not second[0]
+
+    repo.upsert_chunk("doc-1", "doc-1-1", ord=1, text="MFA again", token_count=2)
+    repo.fetch_chunks_for_entities(["MFA", "Reset"], limit=5)
+    assert len(driver.reads) == 2
+
+
+def test_fetch_cache_invalidated_after_write_commits():
+    row = {
+        "chunk_id": "doc-1-0",
+        "text": "Reset MFA",
+        "ord": 0,
+        "doc_id": "doc-1",
+        "title": "Manual",
+    }
+
+    class RacingDriver(FakeDriver):
+        def execute_write(self, func):
+            # Another request reads while the write is still in flight.
+            repo.fetch_chunks_for_entities(["MFA"], limit=5)
+            return super().execute_write(func)
+
+    driver = RacingDriver(read_rows=[row])
+    repo = GraphRepository(driver)
+
+    repo.upsert_chunk("doc-1", "doc-1-1", ord=1, text="MFA again", token_count=2)
+    assert len(driver.reads) == 1
+    repo.fetch_chunks_for_entities(["MFA"], limit=5)
+    assert len(driver.reads) == 2
+
+
+def test_in_memory_fetch_dedupes_chunks_and_stops_at_limit():
+    repo = InMemoryGraphRepository()
+    repo.upsert_document("doc-1", title="Manual")
+    for ord_ in range(3):
+        repo.upsert_chunk("doc-1", f"doc-1-{ord_}", ord=ord_, text="Reset MFA", token_count=2)
+        repo.link_chunk_entity(f"doc-1-{ord_}", repo.upsert_entity("MFA"))
+        repo.link_chunk_entity(f"doc-1-{ord_}", repo.upsert_entity("Reset"))
+
+    records = repo.fetch_chunks_for_entities(["MFA", "Reset"], limit=10)
+    assert sorted(record["id"] for record in records) == ["doc-1-0", "doc-1-1", "doc-1-2"]
+    assert len(repo.fetch_chunks_for_entities(["MFA", "Reset"], limit=2)) == 2
+    assert repo.get_entity_degrees(["MFA", "unknown"]) == {"MFA": 3, "unknown": 0}
 
 
-def test_aura_backend_end_to_end(monkeypatch, make_client, tmp_path):
-    import sys
-    import types
+def test_batch_routes_writes_through_one_transaction():
+    driver = MagicMock(spec=["session"])
+    repo = GraphRepository(driver, database="kb")
 
+    with repo.batch():
+        repo.upsert_document("doc-1", title="Manual")
+        repo.upsert_chunk("doc-1", "doc-1-0", ord=0, text="Hello", token_count=1)
+
+    driver.session.assert_called_once_with(database="kb")
+    session = driver.session.return_value
+    session.begin_transaction.assert_called_once()
+    tx = session.begin_transaction.return_value
+    assert tx.run.call_count == 2
+    tx.commit.assert_called_once()
+    session.execute_write.assert_not_called()
+
+
+def test_session_reused_across_writes_when_driver_lacks_execute_write():
+    driver = MagicMock(spec=["session"])
+    repo = GraphRepository(driver)
+    repo.upsert_document("doc-1", title="Manual")
+    repo.upsert_chunk("doc-1", "chunk-1", ord=0, text="Hello", token_count=10)
+    assert driver.session.call_count == 1
+    assert driver.session.return_value.execute_write.call_count == 2
+
+    repo.close()
+    driver.session.return_value.close.assert_called_once()
+
+
+def test_init_graph_repo_passes_pool_settings_to_driver(monkeypatch):
+    calls = []
+
+    class SpyGraphDatabase:
+        @staticmethod
+        def driver(uri, **kwargs):
+            calls.append((uri, kwargs))
+            return FakeDriver()
+
+    monkeypatch.setattr(main, "GraphDatabase", SpyGraphDatabase)
+    settings = Settings(
+        neo4j_uri="neo4j+s://demo.neo4j.io",
+        neo4j_password="secret",
+        neo4j_max_pool_size=12,
+        neo4j_acquisition_timeout_s=7,
+        neo4j_max_connection_lifetime_s=600,
+    )
+
+    repo, driver = main._init_graph_repo(settings)
+
+    assert isinstance(repo, GraphRepository)
+    assert driver is not None
+    assert calls == [
+        (
+            "neo4j+s://demo.neo4j.io",
+            {
+                "auth": ("neo4j", "secret"),
+                "max_connection_pool_size": 12,
+                "connection_acquisition_timeout": 7,
+                "max_connection_lifetime": 600,
+                "keep_alive": True,
+            },
+        )
+    ]
+
+
+def test_blank_neo4j_database_uses_driver_default():
+    assert Settings(neo4j_database="").neo4j_database is None
+    assert Settings(neo4j_database="  ").neo4j_database is None
+    assert Settings(neo4j_database="reports").neo4j_database == "reports"
+
+
+def test_aura_backend_end_to_end(monkeypatch, make_client):
     store = {
         "documents": {},
         "chunks": {},
@@ -50,6 +327,9 @@ def test_aura_backend_end_to_end(monkeypatch, make_client, tmp_path):
         "entities": {},
     }
 
+    def new_entity(name, type_=None):
+        return {"name": name, "type": type_ or "TERM", "chunks": [], "seen": set(), "degree": 0}
+
     class FakeResult:
         def __init__(self, records):
             self._records = records
@@ -62,49 +342,60 @@ def test_aura_backend_end_to_end(monkeypatch, make_client, tmp_path):
 
     class FakeTx:
         def run(self, statement, **params):
+            if "MERGE (c:Chunk" in statement:
+                for row in params["rows"]:
+                    store["documents"].setdefault(row["doc_id"], {"title": None, "source": None})
+                    store["chunks"][row["id"]] = {
+                        "text": row.get("text", ""),
+                        "ord": row.get("ord", 0),
+                        "tokens": row.get("tokens", 0),
+                    }
+                    store["chunk_docs"][row["id"]] = row["doc_id"]
+                return FakeResult([])
             if "MERGE (d:Document" in statement:
                 store["documents"][params["doc_id"]] = {
                     "title": params.get("title"),
                     "source": params.get("source"),
                 }
                 return FakeResult([])
-            if "MERGE (c:Chunk" in statement:
-                store["chunks"][params["chunk_id"]] = {
-                    "text": params.get("text", ""),
-                    "ord": params.get("ord", 0),
-                    "tokens": params.get("token_count", 0),
-                }
-                return FakeResult([])
             if "MERGE (d)-[:HAS_CHUNK]->(c)" in statement:
-                store["chunk_docs"][params["chunk_id"]] = params["doc_id"]
+                for chunk_id in params["chunk_ids"]:
+                    store["chunk_docs"][chunk_id] = params["doc_id"]
                 return FakeResult([])
             if "MERGE (e:Entity" in statement:
-                entity_id = params["name"].lower()
-                store["entities"].setdefault(
-                    entity_id,
-                    {"name": params["name"], "type": params.get("type", "TERM"), "chunks": set()},
-                )
-                return FakeResult([{"id": entity_id}])
+                for row in params["rows"]:
+                    entity = new_entity(row["name"], row.get("type"))
+                    store["entities"].setdefault(row["id"], entity)
+                return FakeResult([])
             if "MERGE (c)-[:ABOUT]->(e)" in statement:
-                entity = store["entities"].setdefault(
-                    params["entity_id"],
-                    {"name": params["entity_id"], "type": "TERM", "chunks": set()},
-                )
-                entity["chunks"].add(params["chunk_id"])
+                for row in params["rows"]:
+                    entity = store["entities"].setdefault(
+                        row["entity_id"], new_entity(row["entity_id"])
+                    )
+                    # MERGE semantics: a repeated link neither duplicates nor bumps the degree.
+                    if row["chunk_id"] not in entity["seen"]:
+                        entity["seen"].add(row["chunk_id"])
+                        entity["chunks"].append(row["chunk_id"])
+                        entity["degree"] += 1
                 return FakeResult([])
-            if "MATCH (e:Entity) WHERE e.id IN $ids OPTIONAL MATCH" in statement:
+            if "COUNT { (e)--() } AS degree" in statement:
                 results = []
                 for entity_id in params["ids"]:
-                    degree = len(store["entities"].get(entity_id, {"chunks": set()})["chunks"])
+                    entity = store["entities"].get(entity_id)
+                    degree = entity["degree"] if entity else 0
                     results.append({"id": entity_id, "degree": degree})
                 return FakeResult(results)
-            if "MATCH (e:Entity) WHERE e.id IN $ids MATCH (e)<-[:ABOUT]" in statement:
+            if statement.startswith("UNWIND $ids AS eid"):
                 records = []
+                seen = set()
                 for entity_id in params["ids"]:
                     entity = store["entities"].get(entity_id)
                     if not entity:
                         continue
                     for chunk_id in entity["chunks"]:
+                        if chunk_id in seen:
+                            continue
+                        seen.add(chunk_id)
                         chunk = store["chunks"].get(chunk_id, {})
                         doc_id = store["chunk_docs"].get(chunk_id)
                         doc = store["documents"].get(doc_id, {})
@@ -117,7 +408,7 @@ def test_aura_backend_end_to_end(monkeypatch, make_client, tmp_path):
                                 "title": doc.get("title"),
                             }
                         )
-                return FakeResult(records)
+                return FakeResult(records[: params["limit"]])
             if "RETURN 1 AS ok" in statement:
                 return FakeResult([{"ok": 1}])
             return FakeResult([])
@@ -153,60 +444,55 @@ def test_aura_backend_end_to_end(monkeypatch, make_client, tmp_path):
 
     class FakeGraphDatabase:
         @staticmethod
-        def driver(uri, auth=None):
+        def driver(uri, auth=None, **config):
             assert uri.startswith("neo4j+s://")
             assert auth is not None
+            assert config["max_connection_pool_size"] == 8
+            assert config["connection_acquisition_timeout"] == 5
             return FakeDriver()
 
-    fake_module = types.ModuleType("neo4j")
-    fake_module.GraphDatabase = FakeGraphDatabase
-    monkeypatch.setitem(sys.modules, "neo4j", fake_module)
+    monkeypatch.setattr(main, "GraphDatabase", FakeGraphDatabase)
 
     client = make_client(
         {
             "MODEL_PROVIDER": "stub",
             "EMBED_PROVIDER": "stub",
-            "CHROMA_DIR": tmp_path / "chroma",
             "NEO4J_URI": "neo4j+s://demo.neo4j.io",
             "NEO4J_USER": "neo4j",
             "NEO4J_PASSWORD": "secret",
-            "__use_real_repos": True,
+            "NEO4J_MAX_POOL_SIZE": "8",
+            "NEO4J_ACQUISITION_TIMEOUT_S": "5",
         }
     )
-
-    import backend.app.main as main
-
-    try:
-        assert main.GraphDatabase is not None
-        assert main.GraphDatabase.__name__ == "FakeGraphDatabase"
-        uri_value = main.app.state.settings.neo4j_uri
-        assert isinstance(uri_value, str)
-        assert uri_value == "neo4j+s://demo.neo4j.io"
-        repo_initialized, driver_initialized = main._init_graph_repo(main.app.state.settings)
-        assert isinstance(repo_initialized, GraphRepository)
-        assert driver_initialized is not None
-        assert main.app.state.graph_backend == "aura"
-        main.app.state.graph_repo = repo_initialized
-        main.app.state.graph_driver = driver_initialized
-
-        health = client.get("/health").json()
-        assert health["graph_backend"] == "aura"
-        assert health["neo4j_reachable"] is True
-
-        repo = main.app.state.graph_repo
-
-        repo.upsert_document("doc-1", title="Aura Doc")
-        repo.upsert_chunk("doc-1", "doc-1-0", ord=0, text="Reset MFA instructions", token_count=42)
-        repo.link_doc_chunk("doc-1", "doc-1-0")
-        entity_id = repo.upsert_entity("MFA")
-        repo.link_chunk_entity("doc-1-0", entity_id)
-
-        degrees = repo.get_entity_degrees(["MFA"])
-        assert degrees["MFA"] == 1
-
-        records = repo.fetch_chunks_for_entities(["MFA"], limit=5)
-        assert len(records) == 1
-        assert records[0]["metadata"]["doc_id"] == "doc-1"
-        assert records[0]["metadata"]["title"] == "Aura Doc"
-    finally:
-        client.close()
+    state = client.app.state
+
+    assert main.GraphDatabase.__name__ == "FakeGraphDatabase"
+    uri_value = state.settings.neo4j_uri
+    assert isinstance(uri_value, str)
+    assert uri_value == "neo4j+s://demo.neo4j.io"
+    repo_initialized, driver_initialized = main._init_graph_repo(state.settings)
+    assert isinstance(repo_initialized, GraphRepository)
+    assert driver_initialized is not None
+    monkeypatch.setattr(state, "graph_backend", "aura")
+    overrides = client.app.dependency_overrides
+    monkeypatch.setitem(overrides, main.get_graph_repo, lambda: repo_initialized)
+
+    health = client.get("/health").json()
+    assert health["graph_backend"] == "aura"
+    assert health["neo4j_reachable"] is True
+
+    repo = repo_initialized
+
+    repo.upsert_document("doc-1", title="Aura Doc")
+    repo.upsert_chunk("doc-1", "doc-1-0", ord=0, text="Reset MFA instructions", token_count=42)
+    repo.link_doc_chunk("doc-1", "doc-1-0")
+    entity_id = repo.upsert_entity("MFA")
+    repo.link_chunk_entity("doc-1-0", entity_id)
+
+    degrees = repo.get_entity_degrees(["MFA"])
+    assert degrees["MFA"] == 1
+
+    records = repo.fetch_chunks_for_entities(["MFA"], limit=5)
+    assert len(records) == 1
+    assert records[0]["metadata"]["doc_id"] == "doc-1"
+    assert records[0]["metadata"]["title"] == "Aura Doc"
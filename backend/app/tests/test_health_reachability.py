@@ -2,36 +2,34 @@
 
 from __future__ import annotations
 
+import threading
+from types import SimpleNamespace
 from typing import Any
 
+import backend.app.main as main
 
-def test_health_reports_reachability(monkeypatch, make_client, tmp_path):
+
+def test_health_reports_reachability(monkeypatch, make_client, chroma_dir):
     client = make_client(
         {
             "MODEL_PROVIDER": "stub",
             "EMBED_PROVIDER": "stub",
-            "CHROMA_DIR": tmp_path / "chroma",
         }
     )
 
-    import backend.app.main as main
-
     monkeypatch.setattr(main, "_probe_ollama", lambda *_: True, raising=False)
     monkeypatch.setattr(main, "_probe_llamacpp", lambda *_: False, raising=False)
     monkeypatch.setattr(main, "_probe_neo4j", lambda *_: False, raising=False)
     monkeypatch.setattr(main, "_probe_hosted", lambda *_: False, raising=False)
 
-    vector_path = tmp_path / "chroma"
+    vector_path = chroma_dir
 
     def fake_vector_state(*_: Any):
         return str(vector_path), True
 
     monkeypatch.setattr(main, "_vector_store_state", fake_vector_state, raising=False)
 
-    try:
-        response = client.get("/health")
-    finally:
-        client.close()
+    response = client.get("/health")
 
     body = response.json()
     assert body["status"] == "ok"
@@ -53,3 +51,54 @@ def test_health_reports_reachability(monkeypatch, make_client, tmp_path):
     assert body["neo4j_reachable"] is False
     assert body["vector_store_path"] == str(vector_path)
     assert body["vector_store_path_exists"] is True
+
+
+def test_health_runs_probes_concurrently(monkeypatch, make_client):
+    client = make_client(
+        {
+            "MODEL_PROVIDER": "stub",
+            "EMBED_PROVIDER": "stub",
+        }
+    )
+
+    # Every probe blocks until all four are in flight; a serial handler would break the barrier.
+    barrier = threading.Barrier(4, timeout=2)
+
+    def probe(*_: Any) -> bool:
+        barrier.wait()
+        return True
+
+    for name in ("_probe_ollama", "_probe_llamacpp", "_probe_neo4j", "_probe_hosted"):
+        monkeypatch.setattr(main, name, probe, raising=False)
+
+    response = client.get("/health")
+
+    body = response.json()
+    assert body["hosted_reachable"] is True
+    assert body["ollama_reachable"] is True
+    assert body["llamacpp_reachable"] is True
+    assert body["neo4j_reachable"] is True
+
+
+def test_http_probes_are_cached_within_ttl(monkeypatch):
+    calls = []
+
+    class FakeResponse:
+        def raise_for_status(self):
+            return None
+
+    def fake_get(url, headers=None, timeout=None):
+        calls.append(url)
+        return FakeResponse()
+
+    monkeypatch.setattr(main.requests, "get", fake_get)
+    main._http_reachable.cache_clear()
+    settings = SimpleNamespace(ollama_host="http://ollama.test:11434")
+
+    assert main._probe_ollama(settings) is True
+    assert main._probe_ollama(settings) is True
+    assert calls == ["http://ollama.test:11434/api/tags"]
+
+    main._http_reachable.cache_clear()
+    assert main._probe_ollama(settings) is True
+    assert len(calls) == 2
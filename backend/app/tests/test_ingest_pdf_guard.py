@@ -30,25 +30,21 @@ MINIMAL_PDF = (
     reason="pdfminer.six not installed",
     strict=False,
 )
-def test_ingest_pdf_roundtrip(make_client, tmp_path):
+def test_ingest_pdf_roundtrip(make_client):
     client = make_client(
         {
             "MODEL_PROVIDER": "stub",
             "EMBED_PROVIDER": "stub",
-            "CHROMA_DIR": tmp_path / "chroma",
         }
     )
 
-    try:
-        response = client.post(
-            "/ingest/pdf",
-            data={"title": "Sample PDF"},
-            files={"file": ("sample.pdf", MINIMAL_PDF, "application/pdf")},
-        )
-        assert response.status_code == 200
-        body = response.json()
-    finally:
-        client.close()
+    response = client.post(
+        "/ingest/pdf",
+        data={"title": "Sample PDF"},
+        files={"file": ("sample.pdf", MINIMAL_PDF, "application/pdf")},
+    )
+    assert response.status_code == 200
+    body = response.json()
 
     assert body["pages_ingested"] >= 1
     assert body["chunks_ingested"] >= 1
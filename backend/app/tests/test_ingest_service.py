@@ -1,6 +1,8 @@
 from types import SimpleNamespace
 
+import pytest
 from backend.app.adapters.embeddings import StubEmbeddingProvider
+from backend.app.services import ingest_service
 from backend.app.services.ingest_service import IngestService
 
 
@@ -20,6 +22,7 @@ class FakeGraphRepo:
         self.documents = []
         self.chunks = []
         self.entities = []
+        self.chunk_rows = []
 
     def ensure_constraints(self):  # pragma: no cover
         pass
@@ -30,17 +33,31 @@ class FakeGraphRepo:
     def upsert_chunk(self, doc_id, chunk_id, ord, text, token_count):
         self.chunks.append((doc_id, chunk_id, ord, token_count))
 
+    def upsert_chunks_batch(self, rows):
+        self.chunk_rows.extend(rows)
+        for row in rows:
+            self.upsert_chunk(row["doc_id"], row["id"], row["ord"], row["text"], row["tokens"])
+
     def link_doc_chunk(self, doc_id, chunk_id):
         pass
 
+    def link_doc_chunks_batch(self, doc_id, chunk_ids):
+        pass
+
     def upsert_entity(self, name, type="TERM"):
         entity_id = name.lower()
         self.entities.append(entity_id)
         return entity_id
 
+    def upsert_entities_batch(self, rows):
+        return [self.upsert_entity(row["name"], row.get("type", "TERM")) for row in rows]
+
     def link_chunk_entity(self, chunk_id, entity_id, rel="ABOUT"):
         pass
 
+    def link_chunk_entities_batch(self, pairs, rel="ABOUT"):
+        pass
+
 
 def test_ingest_text_stub_pipeline():
     settings = SimpleNamespace(
@@ -60,3 +77,80 @@ def test_ingest_text_stub_pipeline():
     assert response.chunks >= 1
     assert response.vector_count == len(vector_store.records)
     assert len(graph_repo.entities) >= 1
+
+
+def test_graph_failure_is_not_masked_by_vector_failure():
+    class FailingVectorStore(FakeVectorStore):
+        def upsert(self, chunks):
+            raise RuntimeError("chroma down")
+
+    class FailingGraphRepo(FakeGraphRepo):
+        def upsert_chunks_batch(self, rows):
+            raise ValueError("neo4j down")
+
+    service = IngestService(
+        settings=SimpleNamespace(chunk_tokens=32, chunk_overlap=8),
+        vector_store=FailingVectorStore(),
+        graph_repo=FailingGraphRepo(),
+        embedding_provider=StubEmbeddingProvider(dim=8),
+    )
+
+    with pytest.raises(ValueError, match="neo4j down"):
+        service.ingest_text("Manual", "Widget Alpha connects to Widget Beta.")
+
+
+def test_pdf_extraction_falls_back_when_pymupdf_fails(monkeypatch):
+    class BrokenPyMuPDF:
+        @staticmethod
+        def open(stream, filetype):
+            raise ValueError("xref table is corrupt")
+
+    monkeypatch.setattr(ingest_service, "pymupdf", BrokenPyMuPDF)
+    monkeypatch.setattr(ingest_service, "pypdf", None)
+    monkeypatch.setattr(ingest_service, "extract_text", lambda _stream: "page one\fpage two")
+
+    assert ingest_service._extract_pdf_text(b"%PDF-1.4") == ("page one\fpage two", 2)
+
+
+def test_pdf_extraction_keeps_pymupdf_page_count_for_image_only_pdfs(monkeypatch):
+    class ImageOnlyDoc:
+        page_count = 3
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *_exc):
+            return False
+
+        def __iter__(self):
+            return iter([SimpleNamespace(get_text=lambda: "")] * self.page_count)
+
+    monkeypatch.setattr(
+        ingest_service, "pymupdf", SimpleNamespace(open=lambda **_kwargs: ImageOnlyDoc())
+    )
+    monkeypatch.setattr(ingest_service, "pypdf", None)
+    monkeypatch.setattr(ingest_service, "extract_text", lambda _stream: "ocr text")
+
+    assert ingest_service._extract_pdf_text(b"%PDF-1.4") == ("ocr text", 3)
+
+
+@pytest.mark.parametrize("vector_search", [False, True])
+def test_chunk_rows_carry_embeddings_only_with_neo4j_vector_search(vector_search):
+    settings = SimpleNamespace(chunk_tokens=32, chunk_overlap=8, neo4j_vector_search=vector_search)
+    graph_repo = FakeGraphRepo()
+    embeddings = StubEmbeddingProvider(dim=8)
+    service = IngestService(
+        settings=settings,
+        vector_store=FakeVectorStore(),
+        graph_repo=graph_repo,
+        embedding_provider=embeddings,
+    )
+
+    service.ingest_text("Manual", "Widget Alpha connects to Widget Beta.")
+
+    assert graph_repo.chunk_rows
+    for row in graph_repo.chunk_rows:
+        if vector_search:
+            assert row["embedding"] == embeddings.embed_texts([row["text"]])[0]
+        else:
+            assert "embedding" not in row
@@ -3,9 +3,15 @@
 from __future__ import annotations
 
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
 from typing import Dict
 
+import backend.app.main as main
 import pytest
+from backend.app.services import url_crawler
+
 
 class FakeResponse:
     def __init__(self, url: str, text: str, *, status_code: int = 200, content_type: str = "text/html") -> None:
@@ -21,12 +27,31 @@ class FakeSession:
         self._responses = responses
         self.headers: Dict[str, str] = {}
         self.request_log: list[str] = []
+        self.conditional_log: list[str] = []
+        self.adapters: Dict[str, object] = {}
+
+    def mount(self, prefix: str, adapter) -> None:
+        self.adapters[prefix] = adapter
 
-    def get(self, url: str, timeout: float | int = 10):  # noqa: D401 - mimic requests API
+    def get(self, url: str, timeout: float | int = 10, headers: Dict[str, str] | None = None):  # noqa: D401
         self.request_log.append(url)
+        if headers:
+            self.conditional_log.append(url)
+            cached = self._responses.get(url)
+            if cached is not None and headers.get("If-None-Match") == cached.headers.get("ETag"):
+                return FakeResponse(url, "", status_code=304)
         return self._responses.get(url, FakeResponse(url, "", status_code=404, content_type="text/plain"))
 
 
+@pytest.fixture(autouse=True)
+def _empty_conditional_cache():
+    """Keep revalidation state from one test out of the next."""
+
+    url_crawler._CONDITIONAL_CACHE.clear()
+    yield
+    url_crawler._CONDITIONAL_CACHE.clear()
+
+
 @pytest.fixture
 def fake_site(monkeypatch):
     robots = "User-agent: *\nDisallow: /blocked"
@@ -70,73 +95,56 @@ def fake_site(monkeypatch):
     return session
 
 
-def test_url_ingest_disabled(make_client, tmp_path):
-    client = make_client(
-        {
-            "MODEL_PROVIDER": "stub",
-            "EMBED_PROVIDER": "stub",
-            "CHROMA_DIR": tmp_path / "chroma",
-            "ALLOW_URL_INGEST": "0",
-        }
-    )
+def test_url_ingest_disabled(stub_client, monkeypatch):
+    settings = stub_client.app.state.settings.model_copy(update={"allow_url_ingest": False})
+    overrides = stub_client.app.dependency_overrides
+    monkeypatch.setitem(overrides, main.get_app_settings, lambda: settings)
 
-    try:
-        response = client.post("/ingest/url", json={"url": "https://example.com"})
-    finally:
-        client.close()
+    response = stub_client.post("/ingest/url", json={"url": "https://example.com"})
 
     assert response.status_code == 403
     body = response.json()
     assert body["detail"] == "URL ingestion is disabled"
 
 
-def test_crawl_respects_robots_and_limits(fake_site, make_client, tmp_path):
+def test_crawl_respects_robots_and_limits(fake_site, make_client):
     client = make_client(
         {
             "MODEL_PROVIDER": "stub",
             "EMBED_PROVIDER": "stub",
-            "CHROMA_DIR": tmp_path / "chroma",
             "ALLOW_URL_INGEST": "1",
             "URL_MAX_TOTAL_CHARS": "5000",
         }
     )
 
-    try:
-        response = client.post(
-            "/ingest/url",
-            json={"url": "https://example.com/start", "max_depth": 1, "max_pages": 5},
-        )
-    finally:
-        client.close()
+    response = client.post(
+        "/ingest/url",
+        json={"url": "https://example.com/start", "max_depth": 1, "max_pages": 5},
+    )
 
     assert response.status_code == 200
     body = response.json()
     assert body["pages"] == 2
     assert "https://example.com/guide" in fake_site.request_log
+    assert set(fake_site.adapters) == {"http://", "https://"}
     assert "https://example.com/blocked" not in fake_site.request_log
 
 
-def test_main_content_extraction(fake_site, make_client, tmp_path):
+def test_main_content_extraction(fake_site, make_client):
     client = make_client(
         {
             "MODEL_PROVIDER": "stub",
             "EMBED_PROVIDER": "stub",
-            "CHROMA_DIR": tmp_path / "chroma",
             "ALLOW_URL_INGEST": "1",
             "URL_RATE_LIMIT_SEC": "0",
         }
     )
 
-    try:
-        response = client.post(
-            "/ingest/url",
-            json={"url": "https://example.com/start", "max_depth": 0, "max_pages": 1},
-        )
-        import backend.app.main as main
-
-        chunks = list(main.app.state.graph_repo.chunks.values())
-    finally:
-        client.close()
+    response = client.post(
+        "/ingest/url",
+        json={"url": "https://example.com/start", "max_depth": 0, "max_pages": 1},
+    )
+    chunks = list(client.app.state.graph_repo.chunks.values())
 
     body = response.json()
     assert body["pages"] == 1
@@ -147,12 +155,11 @@ def test_main_content_extraction(fake_site, make_client, tmp_path):
     assert "Menu" not in combined_text
 
 
-def test_url_ingest_end_to_end(fake_site, make_client, tmp_path):
+def test_url_ingest_end_to_end(fake_site, make_client):
     client = make_client(
         {
             "MODEL_PROVIDER": "stub",
             "EMBED_PROVIDER": "stub",
-            "CHROMA_DIR": tmp_path / "chroma",
             "ALLOW_URL_INGEST": "1",
             "URL_RATE_LIMIT_SEC": "0",
             "URL_MAX_TOTAL_CHARS": "10000",
@@ -160,17 +167,12 @@ def test_url_ingest_end_to_end(fake_site, make_client, tmp_path):
     )
 
     graph_repo = None
-    try:
-        response = client.post(
-            "/ingest/url",
-            json={"url": "https://example.com/start", "max_depth": 1, "max_pages": 2},
-        )
-        body = response.json()
-        import backend.app.main as main
-
-        graph_repo = main.app.state.graph_repo
-    finally:
-        client.close()
+    response = client.post(
+        "/ingest/url",
+        json={"url": "https://example.com/start", "max_depth": 1, "max_pages": 2},
+    )
+    body = response.json()
+    graph_repo = client.app.state.graph_repo
 
     assert response.status_code == 200
     assert body["pages"] == 2
@@ -180,3 +182,114 @@ def test_url_ingest_end_to_end(fake_site, make_client, tmp_path):
     assert graph_repo is not None
     if hasattr(graph_repo, "documents"):
         assert len(graph_repo.documents) >= 2
+
+
+def test_recrawl_revalidates_with_etag():
+    page = FakeResponse(
+        "https://example.com/kb",
+        "<html><head><title>KB</title></head>"
+        "<body><p>Unlock accounts via the portal.</p></body></html>",
+    )
+    page.headers["ETag"] = '"v1"'
+    session = FakeSession({"https://example.com/kb": page})
+    limits = url_crawler.CrawlLimits(
+        max_depth=0, max_pages=1, max_total_chars=5000, rate_limit_sec=0
+    )
+
+    crawler = url_crawler.UrlCrawler(settings=SimpleNamespace(), session=session)
+    first = crawler.crawl("https://example.com/kb", overrides=limits)
+    second = crawler.crawl("https://example.com/kb", overrides=limits)
+
+    assert session.conditional_log == ["https://example.com/kb"]
+    assert [p.content for p in second.pages] == [p.content for p in first.pages]
+    assert "Unlock accounts" in second.pages[0].content
+
+
+def test_crawl_fetches_pages_concurrently_without_rate_limit():
+    links = "".join(f'<a href="/kb{i}">KB {i}</a>' for i in range(3))
+    responses = {
+        "https://example.com/kb": FakeResponse(
+            "https://example.com/kb", f"<html><body><p>Index.</p>{links}</body></html>"
+        ),
+    }
+    for i in range(3):
+        url = f"https://example.com/kb{i}"
+        responses[url] = FakeResponse(url, f"<html><body><p>Article {i}.</p></body></html>")
+        responses[url].headers["ETag"] = f'"kb{i}"'
+
+    # The three child pages only return once all of them are in flight together.
+    barrier = threading.Barrier(3, timeout=2)
+
+    class BarrierSession(FakeSession):
+        def get(self, url, timeout=10, headers=None):
+            if url.startswith("https://example.com/kb") and url[-1].isdigit():
+                barrier.wait()
+            return super().get(url, timeout=timeout, headers=headers)
+
+    session = BarrierSession(responses)
+    limits = url_crawler.CrawlLimits(
+        max_depth=1, max_pages=4, max_total_chars=5000, rate_limit_sec=0
+    )
+    crawler = url_crawler.UrlCrawler(settings=SimpleNamespace(url_concurrency=3), session=session)
+
+    result = crawler.crawl("https://example.com/kb", overrides=limits)
+
+    assert sorted(page.content for page in result.pages) == [
+        "Article 0.",
+        "Article 1.",
+        "Article 2.",
+        "Index.",
+    ]
+    # Pages fetched by wave workers are still recorded for revalidation.
+    cached = [url_crawler._CONDITIONAL_CACHE.get(f"https://example.com/kb{i}") for i in range(3)]
+    assert [entry.etag for entry in cached] == ['"kb0"', '"kb1"', '"kb2"']
+
+
+def test_crawl_skips_links_inside_stripped_boilerplate():
+    page = """
+        <html><body>
+            <nav><a href="/menu">Menu</a></nav>
+            <article><p>Reset steps.</p><a href=/guide>Guide</a></article>
+            <footer><a href="/legal">Legal</a></footer>
+            <script>var s = '<a href="/from-script">x</a>';</script>
+        </body></html>
+    """
+    responses = {
+        "https://example.com/kb": FakeResponse("https://example.com/kb", page),
+        "https://example.com/guide": FakeResponse(
+            "https://example.com/guide", "<html><body><p>Guide body.</p></body></html>"
+        ),
+    }
+    session = FakeSession(responses)
+    limits = url_crawler.CrawlLimits(
+        max_depth=1, max_pages=5, max_total_chars=5000, rate_limit_sec=0
+    )
+    crawler = url_crawler.UrlCrawler(settings=SimpleNamespace(), session=session)
+
+    result = crawler.crawl("https://example.com/kb", overrides=limits)
+
+    assert [page.url for page in result.pages] == ["https://example.com/kb", "https://example.com/guide"]
+    assert not {"https://example.com/menu", "https://example.com/legal"} & set(session.request_log)
+    assert "https://example.com/from-script" not in session.request_log
+
+
+def test_conditional_cache_stays_bounded_under_concurrent_writers():
+    cache = url_crawler._ConditionalCache(maxsize=8)
+
+    def fill(worker):
+        for i in range(200):
+            url = f"https://example.com/{worker}/{i}"
+            cache.put(url, url_crawler._CachedPage(url, "body", {}, '"v"', ""))
+            cache.get(f"https://example.com/{worker}/{i // 2}")
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(fill, range(4)))
+
+    assert len(cache._pages) == 8
+
+
+def test_retry_policy_only_retries_gateway_statuses():
+    retry = url_crawler._RETRY
+    assert (retry.connect, retry.read) == (0, 0)
+    assert retry.is_retry("GET", 503)
+    assert not retry.is_retry("GET", 500)
@@ -3,19 +3,15 @@
 from __future__ import annotations
 
 
-def test_language_model_returns_text(make_client, tmp_path):
+def test_language_model_returns_text(make_client):
     client = make_client(
         {
             "MODEL_PROVIDER": "stub",
             "EMBED_PROVIDER": "stub",
-            "CHROMA_DIR": tmp_path / "chroma",
         }
     )
 
-    try:
-        response = client.post("/ask", json={"question": "Is anyone there?"})
-    finally:
-        client.close()
+    response = client.post("/ask", json={"question": "Is anyone there?"})
 
     assert response.status_code == 200
     body = response.json()
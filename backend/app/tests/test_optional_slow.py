@@ -14,7 +14,7 @@ except ImportError:  # pragma: no cover
 
 
 @pytest.mark.slow
-def test_ask_end_to_end_with_neo4j(make_client, tmp_path):  # pragma: no cover - slow path
+def test_ask_end_to_end_with_neo4j(make_client):  # pragma: no cover - slow path
     if GraphDatabase is None:
         pytest.skip("neo4j driver not installed")
 
@@ -35,23 +35,19 @@ def test_ask_end_to_end_with_neo4j(make_client, tmp_path):  # pragma: no cover -
         {
             "MODEL_PROVIDER": "stub",
             "EMBED_PROVIDER": "stub",
-            "CHROMA_DIR": tmp_path / "chroma",
             "NEO4J_URI": uri,
             "NEO4J_USER": user,
             "NEO4J_PASSWORD": password,
         }
     )
 
-    try:
-        ingest_resp = client.post(
-            "/ingest/paste",
-            json={"title": "Neo4j Doc", "text": "Graph upserts should succeed."},
-        )
-        ingest_resp.raise_for_status()
-        ask_resp = client.post("/ask", json={"question": "Graph upserts question"})
-        ask_resp.raise_for_status()
-    finally:
-        client.close()
+    ingest_resp = client.post(
+        "/ingest/paste",
+        json={"title": "Neo4j Doc", "text": "Graph upserts should succeed."},
+    )
+    ingest_resp.raise_for_status()
+    ask_resp = client.post("/ask", json={"question": "Graph upserts question"})
+    ask_resp.raise_for_status()
 
     with driver.session() as session:
         result = session.run("MATCH (d:Document {title: $title}) RETURN count(d) AS c", title="Neo4j Doc")
@@ -60,28 +56,35 @@ def test_ask_end_to_end_with_neo4j(make_client, tmp_path):  # pragma: no cover -
     assert count >= 1
 
 
-@pytest.mark.slow
-def test_provider_ollama_live(make_client, tmp_path):  # pragma: no cover - slow path
+@pytest.fixture(scope="session")
+def ollama_unreachable_reason() -> str | None:
+    """Probe Ollama once per session; return why it is unusable, or None when it answers."""
+
     host = os.getenv("OLLAMA_HOST", "http://localhost:11434")
     try:
         response = requests.get(f"{host.rstrip('/')}/api/tags", timeout=2)
         response.raise_for_status()
     except Exception as exc:
-        pytest.skip(f"Ollama not reachable: {exc}")
+        return str(exc)
+    return None
+
+
+@pytest.mark.slow
+def test_provider_ollama_live(
+    ollama_unreachable_reason, make_client
+):  # pragma: no cover - slow path
+    if ollama_unreachable_reason is not None:
+        pytest.skip(f"Ollama not reachable: {ollama_unreachable_reason}")
 
     client = make_client(
         {
             "MODEL_PROVIDER": "ollama",
             "MODEL_NAME": os.getenv("MODEL_NAME", "phi3:mini"),
-            "CHROMA_DIR": tmp_path / "chroma",
             "EMBED_PROVIDER": "stub",
         }
     )
 
-    try:
-        body = client.post("/ask", json={"question": "Say hi"}).json()
-    finally:
-        client.close()
+    body = client.post("/ask", json={"question": "Say hi"}).json()
 
     assert body["provider"] == "ollama"
     assert body["answer"]
@@ -2,30 +2,19 @@
 
 from __future__ import annotations
 
+import backend.app.main as main
+import pytest
 from backend.app.core.config import DEFAULT_STUB_ANSWER
 
 
-def test_health_returns_status_and_provider(monkeypatch, make_client, tmp_path):
-    client = make_client(
-        {
-            "MODEL_PROVIDER": "stub",
-            "EMBED_PROVIDER": "stub",
-            "CHROMA_DIR": tmp_path / "chroma",
-        }
-    )
-
-    import backend.app.main as main
-
+def test_health_returns_status_and_provider(monkeypatch, stub_client, chroma_dir):
     monkeypatch.setattr(main, "_probe_ollama", lambda *_: False, raising=False)
     monkeypatch.setattr(main, "_probe_llamacpp", lambda *_: False, raising=False)
     monkeypatch.setattr(main, "_probe_neo4j", lambda *_: False, raising=False)
     monkeypatch.setattr(main, "_probe_hosted", lambda *_: False, raising=False)
-    monkeypatch.setattr(main, "_vector_store_state", lambda *_: (str(tmp_path / "chroma"), True), raising=False)
+    monkeypatch.setattr(main, "_vector_store_state", lambda *_: (str(chroma_dir), True), raising=False)
 
-    try:
-        response = client.get("/health")
-    finally:
-        client.close()
+    response = stub_client.get("/health")
 
     assert response.status_code == 200
     body = response.json()
@@ -45,42 +34,21 @@ def test_health_returns_status_and_provider(monkeypatch, make_client, tmp_path):
     assert body["graph_backend"] == "inmemory"
 
 
-def test_ask_returns_stub_answer(make_client, tmp_path):
-    client = make_client(
-        {
-            "MODEL_PROVIDER": "stub",
-            "EMBED_PROVIDER": "stub",
-            "CHROMA_DIR": tmp_path / "chroma",
-        }
-    )
-
-    try:
-        response = client.post("/ask", json={"question": "hello"})
-    finally:
-        client.close()
+@pytest.mark.parametrize("question", ["hello", "test"])
+def test_ask_returns_stub_answer(stub_client, question):
+    response = stub_client.post("/ask", json={"question": question})
 
     assert response.status_code == 200
     body = response.json()
     assert body["answer"] == DEFAULT_STUB_ANSWER
     assert body["provider"] == "stub"
-    assert body["question"] == "hello"
+    assert body["question"] == question
     assert isinstance(body.get("citations"), list)
 
 
-def test_ask_rejects_payload_over_one_megabyte(make_client, tmp_path):
-    client = make_client(
-        {
-            "MODEL_PROVIDER": "stub",
-            "EMBED_PROVIDER": "stub",
-            "CHROMA_DIR": tmp_path / "chroma",
-        }
-    )
-
-    try:
-        big_question = "a" * (1024 * 1024 + 1)
-        response = client.post("/ask", json={"question": big_question})
-    finally:
-        client.close()
+def test_ask_rejects_payload_over_one_megabyte(stub_client):
+    big_question = "a" * (1024 * 1024 + 1)
+    response = stub_client.post("/ask", json={"question": big_question})
 
     assert response.status_code == 413
     assert response.json()["detail"] == "Payload too large"
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from types import SimpleNamespace
 
+import pytest
 from backend.app.rag.retrieve import Retriever
 from backend.app.store.graph_repo import InMemoryGraphRepository
 from backend.app.store.vector_chroma import VectorChromaStore
@@ -14,7 +15,7 @@ class DummyEmbedder:
         self.mapping = mapping
 
     def embed_texts(self, texts):
-        return [self.mapping[text] for text in texts]
+        return list(map(self.mapping.__getitem__, texts))
 
 
 def _chunk(text, doc_id, chunk_id, ord_, embedding):
@@ -26,24 +27,36 @@ def _chunk(text, doc_id, chunk_id, ord_, embedding):
     }
 
 
-def test_vector_and_hybrid_retrieval(tmp_path):
-    store = VectorChromaStore(path=str(tmp_path / "chroma"))
+@pytest.fixture(scope="module")
+def populated_store_and_graph(tmp_path_factory):
+    """Build the Alpha/Beta corpus once in its own Chroma store and graph for the module."""
+
+    store = VectorChromaStore(path=str(tmp_path_factory.mktemp("chroma")))
     graph = InMemoryGraphRepository()
 
     graph.upsert_document("doc1", "Alpha Doc")
-    graph.upsert_chunk("doc1", "doc1-0", 0, "Alpha systems overview", 10)
-    graph.upsert_chunk("doc1", "doc1-1", 1, "Alpha follow up", 10)
-    graph.link_doc_chunk("doc1", "doc1-0")
-    graph.link_doc_chunk("doc1", "doc1-1")
-    alpha_id = graph.upsert_entity("Alpha")
-    graph.link_chunk_entity("doc1-0", alpha_id)
-    graph.link_chunk_entity("doc1-1", alpha_id)
-
     graph.upsert_document("doc2", "Beta Doc")
-    graph.upsert_chunk("doc2", "doc2-0", 0, "Beta operations log", 10)
-    graph.link_doc_chunk("doc2", "doc2-0")
-    beta_id = graph.upsert_entity("Beta")
-    graph.link_chunk_entity("doc2-0", beta_id)
+    chunk_rows = [
+        ("doc1", "doc1-0", 0, "Alpha systems overview"),
+        ("doc1", "doc1-1", 1, "Alpha follow up"),
+        ("doc2", "doc2-0", 0, "Beta operations log"),
+    ]
+    graph.upsert_chunks_batch(
+        [
+            {"id": chunk_id, "doc_id": doc_id, "ord": ord_, "text": text, "tokens": 10}
+            for doc_id, chunk_id, ord_, text in chunk_rows
+        ]
+    )
+    graph.link_doc_chunks_batch("doc1", ["doc1-0", "doc1-1"])
+    graph.link_doc_chunks_batch("doc2", ["doc2-0"])
+    alpha_id, beta_id = graph.upsert_entities_batch([{"name": "Alpha"}, {"name": "Beta"}])
+    graph.link_chunk_entities_batch(
+        [
+            {"chunk_id": "doc1-0", "entity_id": alpha_id},
+            {"chunk_id": "doc1-1", "entity_id": alpha_id},
+            {"chunk_id": "doc2-0", "entity_id": beta_id},
+        ]
+    )
 
     store.upsert(
         [
@@ -52,7 +65,11 @@ def test_vector_and_hybrid_retrieval(tmp_path):
             _chunk("Alpha follow up", "doc1", "doc1-1", 1, [0.8, 0.1, 0.0]),
         ]
     )
+    return store, graph
+
 
+def test_vector_and_hybrid_retrieval(populated_store_and_graph):
+    store, graph = populated_store_and_graph
     embedder = DummyEmbedder({
         "Tell me about Alpha": [1.0, 0.0, 0.0],
     })
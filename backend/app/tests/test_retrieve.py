@@ -1,3 +1,4 @@
+from itertools import islice
 from types import SimpleNamespace
 
 from backend.app.adapters.embeddings import StubEmbeddingProvider
@@ -6,24 +7,27 @@ from backend.app.rag.retrieve import Retriever
 
 class VectorStub:
     def __init__(self, results):
-        self.results = results
+        self.results = tuple(results)
         self.queries = []
 
     def search(self, embedding, top_k):
         self.queries.append((embedding, top_k))
-        return self.results[:top_k]
+        return list(islice(self.results, top_k))
 
 
 class GraphStub:
     def __init__(self, degrees=None, chunks=None):
         self._degrees = degrees or {}
-        self._chunks = chunks or []
+        self._chunks = tuple(chunks or ())
+
+        self.degree_lookups = 0
 
     def get_entity_degrees(self, names):
+        self.degree_lookups += 1
         return {name: self._degrees.get(name, 0) for name in names}
 
     def fetch_chunks_for_entities(self, names, limit):
-        return self._chunks[:limit]
+        return list(islice(self._chunks, limit))
 
 
 sample_vector_results = [
@@ -65,3 +69,46 @@ def test_hybrid_filters_vector_results():
     results = retriever.hybrid_search("Widget Alpha details", top_k=2)
     assert len(results) == 1
     assert results[0]["id"] == "chunk-1"
+
+
+def test_hybrid_uses_fused_graph_query_when_enabled():
+    fused = [{"id": "chunk-9", "metadata": {"doc_id": "doc-9"}, "score": 0.05, "text": "fused"}]
+
+    class FusedGraphStub(GraphStub):
+        def __init__(self):
+            super().__init__(degrees={"widget alpha": 2}, chunks=sample_vector_results)
+            self.calls = []
+
+        def hybrid_search(self, query_embedding, names, top_k):
+            self.calls.append((names, top_k))
+            return fused
+
+    graph = FusedGraphStub()
+    vector = VectorStub(sample_vector_results)
+    retriever = Retriever(
+        settings=SimpleNamespace(top_k=2, neo4j_vector_search=True),
+        vector_store=vector,
+        graph_repo=graph,
+        embedding_provider=StubEmbeddingProvider(dim=4),
+    )
+    results = retriever.hybrid_search("Widget Alpha details", top_k=2)
+    assert results == fused
+    assert graph.calls == [(["widget alpha"], 2)]
+    assert vector.queries == []
+
+
+def test_hybrid_reuses_linked_entities_when_fused_query_is_empty():
+    class EmptyFusedGraphStub(GraphStub):
+        def hybrid_search(self, query_embedding, names, top_k):
+            return []
+
+    graph = EmptyFusedGraphStub(degrees={"widget alpha": 2}, chunks=sample_vector_results[:1])
+    retriever = Retriever(
+        settings=SimpleNamespace(top_k=2, neo4j_vector_search=True),
+        vector_store=VectorStub(sample_vector_results),
+        graph_repo=graph,
+        embedding_provider=StubEmbeddingProvider(dim=4),
+    )
+    results = retriever.hybrid_search("Widget Alpha details", top_k=2)
+    assert [item["id"] for item in results] == ["chunk-1"]
+    assert graph.degree_lookups == 1
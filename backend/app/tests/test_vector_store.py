@@ -1,10 +1,12 @@
-from backend.app.store.vector_chroma import VectorChromaStore
+import threading
+from unittest.mock import MagicMock
+
 from backend.app.adapters.embeddings import StubEmbeddingProvider
+from backend.app.store.vector_chroma import InMemoryVectorStore
 
 
-def test_chroma_upsert_and_search(tmp_path):
-    store_path = tmp_path / "chroma"
-    store = VectorChromaStore(path=str(store_path))
+def test_chroma_upsert_and_search(chroma_store):
+    store = chroma_store
 
     provider = StubEmbeddingProvider(dim=4)
     embeddings = provider.embed_texts(["chunk one", "chunk two"])
@@ -30,3 +32,87 @@ def test_chroma_upsert_and_search(tmp_path):
     assert len(results) == 1
     assert results[0]["id"] == "chunk-1"
     assert "text" in results[0]
+
+    store.clear()
+    assert store.search(query_embedding, top_k=1) == []
+
+
+def test_in_memory_search_ranks_by_distance():
+    store = InMemoryVectorStore()
+    store.upsert(
+        [
+            {"id": "far", "text": "far", "metadata": {}, "embedding": [5.0, 5.0]},
+            {"id": "near", "text": "near", "metadata": {}, "embedding": [1.0, 0.0]},
+            {"id": "mid", "text": "mid", "metadata": {}, "embedding": [2.0, 2.0]},
+        ]
+    )
+
+    results = store.search([1.0, 0.1], top_k=2)
+    assert [item["id"] for item in results] == ["near", "mid"]
+    assert results[0]["score"] < results[1]["score"]
+
+    store.upsert([{"id": "exact", "text": "exact", "metadata": {}, "embedding": [1.0, 0.1]}])
+    assert store.search([1.0, 0.1], top_k=1)[0]["id"] == "exact"
+
+
+def test_chroma_upsert_splits_large_ingests(chroma_store, monkeypatch):
+    store = chroma_store
+    monkeypatch.setattr(store, "_collection", MagicMock())
+    chunks = [
+        {"id": f"chunk-{idx}", "text": "t", "metadata": {}, "embedding": [0.0]}
+        for idx in range(2500)
+    ]
+
+    store.upsert(chunks)
+
+    sizes = [len(call.kwargs["ids"]) for call in store._collection.upsert.call_args_list]
+    assert sizes == [1000, 1000, 500]
+
+
+def test_in_memory_search_falls_back_to_insertion_order_without_embeddings():
+    store = InMemoryVectorStore()
+    store.upsert([{"id": f"chunk-{idx}", "text": "t", "metadata": {}} for idx in range(5)])
+
+    results = store.search([0.1, 0.2], top_k=2)
+    assert [item["id"] for item in results] == ["chunk-0", "chunk-1"]
+    assert results[0]["score"] is None
+
+
+def test_chroma_upsert_replays_earlier_batches_after_reset(chroma_store, monkeypatch):
+    store = chroma_store
+    collection = MagicMock()
+    collection.upsert.side_effect = [None, TypeError("legacy metadata"), None, None]
+    monkeypatch.setattr(store, "_collection", collection)
+    monkeypatch.setattr(store, "_reset_collection", lambda: None)
+    chunks = [
+        {"id": f"chunk-{idx}", "text": "t", "metadata": {}, "embedding": [0.0]}
+        for idx in range(1500)
+    ]
+
+    store.upsert(chunks)
+
+    firsts = [call.kwargs["ids"][0] for call in collection.upsert.call_args_list]
+    assert firsts == ["chunk-0", "chunk-1000", "chunk-0", "chunk-1000"]
+
+
+def test_in_memory_search_never_caches_a_stale_index_over_an_upsert():
+    store = InMemoryVectorStore()
+    store.upsert([{"id": "old", "text": "old", "metadata": {}, "embedding": [5.0, 5.0]}])
+    original = store._embedding_matrix
+    writer = threading.Thread(
+        target=store.upsert,
+        args=([{"id": "new", "text": "new", "metadata": {}, "embedding": [1.0, 0.0]}],),
+    )
+
+    def racing_matrix():
+        # The upsert from another thread must wait until this search has cached its snapshot.
+        writer.start()
+        writer.join(timeout=0.05)
+        return original()
+
+    store._embedding_matrix = racing_matrix
+    assert store.search([1.0, 0.0], top_k=1)[0]["id"] == "old"
+    store._embedding_matrix = original
+    writer.join()
+
+    assert store.search([1.0, 0.0], top_k=1)[0]["id"] == "new"
@@ -12,12 +12,26 @@ from pathlib import Path
 from typing import Any, Dict, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:  # optional faster JSON decoder for the token loop
+    from orjson import loads as _loads
+except ImportError:  # stdlib json accepts bytes too
+    _loads = json.loads
 
 
 PROMPT = "Give a one sentence status update: confirm DeskMate is ready."  # short, deterministic
 LOG_PATH = Path("logs/mac-air-check.txt")
 DEFAULT_BACKEND = os.getenv("SDC_API_BASE", "http://localhost:8000")
 DEFAULT_OLLAMA = os.getenv("OLLAMA_HOST", "http://localhost:11434")
+# Ollama streams compact JSON; quotes inside generated text are escaped, so these never false-match.
+_DONE_MARKER = b'"done":true'
+_ERROR_MARKER = b'"error"'
+
+# One keep-alive session so repeated calls (notably hosted TLS) skip connection setup.
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
 
 
 @dataclass
@@ -38,7 +52,7 @@ class HostedResult:
 
 def fetch_health() -> Dict[str, Any] | None:
     try:
-        response = requests.get(f"{DEFAULT_BACKEND.rstrip('/')}/health", timeout=2)
+        response = _SESSION.get(f"{DEFAULT_BACKEND.rstrip('/')}/health", timeout=2)
         response.raise_for_status()
         return response.json()
     except requests.RequestException:
@@ -57,14 +71,19 @@ def measure_local(model: str, host: str) -> LocalResult:
     first_token: Optional[float] = None
     tokens = 0
     try:
-        with requests.post(url, json=payload, stream=True, timeout=(5, 60)) as response:
+        with _SESSION.post(url, json=payload, stream=True, timeout=(5, 60)) as response:
             response.raise_for_status()
-            for line in response.iter_lines(decode_unicode=True):
+            # Raw bytes go straight to the decoder, skipping a per-chunk UTF-8 decode pass.
+            for line in response.iter_lines():
                 if not line:
                     continue
+                if first_token is not None and _DONE_MARKER not in line and _ERROR_MARKER not in line:
+                    # Past the first token only the done/error lines carry data we report.
+                    tokens += 1
+                    continue
                 try:
-                    data = json.loads(line)
-                except json.JSONDecodeError:
+                    data = _loads(line)
+                except ValueError:
                     continue
                 if data.get("error"):
                     return LocalResult(model, None, None, f"Local error: {data['error']}")
@@ -97,7 +116,7 @@ def measure_hosted(model: str, api_key: str | None, url: str) -> HostedResult:
     }
     start = time.perf_counter()
     try:
-        response = requests.post(url, headers=headers, json=payload, timeout=30)
+        response = _SESSION.post(url, headers=headers, json=payload, timeout=30)
         response.raise_for_status()
         _ = response.json()
     except requests.RequestException as exc: